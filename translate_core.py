@@ -0,0 +1,95 @@
+"""
+Shared plumbing for the Hindi -> English translators (v1 and v3).
+
+Both talk to Groq's OpenAI-compatible endpoint, pace their requests to its
+rate limits, and parse JSON replies that the model may wrap in markdown
+code fences.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import re
+import time
+
+import httpx
+from openai import AsyncOpenAI
+
+GROQ_BASE_URL = "https://api.groq.com/openai/v1"
+
+# Body of a ```json ... ``` (or bare ```) fence; the closing fence may be
+# missing when a streamed reply was cut as soon as the JSON was complete.
+RE_FENCE = re.compile(r"```(?:json)?\s*(.*?)\s*(?:```|\Z)", re.DOTALL)
+
+
+def make_client(api_key: str) -> AsyncOpenAI:
+    """Groq client on one HTTP/2 keep-alive pool shared by every request of a
+    run, so only the first call pays the TCP + TLS handshake.
+
+    client.close() also closes the pool.
+    """
+    http_client = httpx.AsyncClient(
+        http2=True,
+        limits=httpx.Limits(
+            max_connections=100,
+            max_keepalive_connections=20,
+            keepalive_expiry=300,
+        ),
+        timeout=httpx.Timeout(60.0, connect=10.0),
+    )
+    return AsyncOpenAI(
+        api_key=api_key,
+        base_url=GROQ_BASE_URL,
+        http_client=http_client,
+    )
+
+
+class TokenBucket:
+    """Async token bucket: holds up to `capacity` tokens, refilled at `refill_rate`/s."""
+
+    def __init__(self, capacity: float, refill_rate: float):
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.tokens = capacity
+        self.last_refill = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed = now - self.last_refill
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.refill_rate)
+        self.last_refill = now
+
+    async def acquire(self, tokens: float = 1):
+        """Wait until `tokens` are available, then take them."""
+        # A single request larger than the bucket would otherwise wait forever
+        tokens = min(tokens, self.capacity)
+        async with self._lock:
+            self._refill()
+            while self.tokens < tokens:
+                deficit = tokens - self.tokens
+                await asyncio.sleep(deficit / self.refill_rate)
+                self._refill()
+            self.tokens -= tokens
+
+    def penalize(self, retry_seconds: float):
+        """Drain the bucket so the next acquire waits out the provider's retry-after."""
+        self._refill()
+        self.tokens = -retry_seconds * self.refill_rate
+
+
+def parse_retry_seconds(error_str: str) -> int | None:
+    """Extract 'try again in XmYs' from Groq error message → total seconds."""
+    m = re.search(r'try again in (\d+)m([\d.]+)s', error_str, re.IGNORECASE)
+    if m:
+        return int(m.group(1)) * 60 + int(float(m.group(2)))
+    m = re.search(r'try again in ([\d.]+)s', error_str, re.IGNORECASE)
+    if m:
+        return int(float(m.group(1)))
+    return None
+
+
+def strip_fence(text: str) -> str:
+    """Return the contents of the first code fence in text, or text itself."""
+    m = RE_FENCE.search(text)
+    return m.group(1) if m else text.strip()
@@ -7,13 +7,17 @@ import sys
 import time
 
 from v1.scraper import scrape_epaper
-from v1.translator import translate_articles
+from v1.translator import translate_articles, translate_articles_batch
 from v1.ocr import run_ocr
 from v1.renderer import render_html
 
 
 def main():
-    date = sys.argv[1] if len(sys.argv) > 1 else "2026-02-25"
+    # --batch: translate through the provider's Batch API (cheaper, but
+    # waits for the job to finish, up to 24h)
+    use_batch = "--batch" in sys.argv[1:]
+    args = [a for a in sys.argv[1:] if a != "--batch"]
+    date = args[0] if args else "2026-02-25"
 
     print(f"═══════════════════════════════════════════")
     print(f"  Aaj Tak Epaper → English Edition")
@@ -26,7 +30,10 @@ def main():
     scrape_epaper(date)
 
     print(f"\n[2/4] Translating articles...")
-    translate_articles(date)
+    if use_batch:
+        translate_articles_batch(date)
+    else:
+        translate_articles(date)
 
     print(f"\n[3/4] Running OCR to detect text regions...")
     run_ocr(date)
@@ -9,14 +9,33 @@ Output: data/{date}/articles_ocr.json  — same structure as
 articles_translated.json but every article gains a `text_blocks` list.
 """
 
+import hashlib
 import json
 import os
+import queue
+import struct
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 import easyocr
 import numpy as np
+import orjson
+import torch
 from PIL import Image
 
+try:
+    from turbojpeg import TJPF_RGB, TurboJPEG
+    _turbojpeg = TurboJPEG()
+except (ImportError, RuntimeError, OSError):  # optional — PIL decodes otherwise
+    _turbojpeg = None
+
+try:
+    import shapely
+    from shapely.strtree import STRtree
+except ImportError:  # optional — fall back to the dense broadcast mask
+    STRtree = None
+
 DATA_DIR = "data"
 OUTPUT_DIR = "output"
 
@@ -26,64 +45,130 @@ OUTPUT_DIR = "output"
 COORD_SPACE_W = 1128
 COORD_SPACE_H = 2050
 
+# Pages per readtext_batched call.  Larger batches amortise CUDA launch and
+# allocation cost across pages at the price of GPU memory.
+OCR_BATCH_SIZE = 4
+
+# Pages taller than this are downscaled before detection.  CRAFT's cost
+# scales with pixel count, and zone matching works in the resized pixel
+# space (output is stored as percentages), so no layout precision is lost.
+OCR_MAX_HEIGHT = 1600
+
+# Run the CRAFT detector and the recogniser in FP16 on CUDA.  Half precision
+# roughly halves memory traffic for these memory-bound convnets; easyocr's
+# post-processing still sees float32 tensors.
+OCR_FP16 = os.getenv("OCR_FP16", "1") != "0"
+
 
-class _NumpyEncoder(json.JSONEncoder):
-    """JSON encoder that handles numpy types."""
-    def default(self, obj):
-        if isinstance(obj, (np.integer,)):
-            return int(obj)
-        if isinstance(obj, (np.floating,)):
-            return float(obj)
-        if isinstance(obj, np.ndarray):
-            return obj.tolist()
-        return super().default(obj)
+# Structure-of-arrays layout for a page's OCR boxes (image-pixel coords).
+_OCR_BOX_DTYPE = np.dtype([
+    ("left", "f8"), ("top", "f8"), ("right", "f8"), ("bottom", "f8"),
+    ("width", "f8"), ("height", "f8"), ("conf", "f8"), ("text", "O"),
+])
 
 
 def _paths(date_str: str):
     data_dir = os.path.join(DATA_DIR, date_str)
-    images_dir = os.path.join(OUTPUT_DIR, date_str, "images")
+    # Per-page image path template; filled with str.format per page instead
+    # of re-joining the directory components every time.
+    page_img_fmt = os.path.join(OUTPUT_DIR, date_str, "images", "page_{}.jpg")
     translated_file = os.path.join(data_dir, "articles_translated.json")
     ocr_file = os.path.join(data_dir, "articles_ocr.json")
-    return translated_file, ocr_file, images_dir
+    return translated_file, ocr_file, page_img_fmt
 
 
-def _box_inside_zone(ocr_box, zone, margin=10):
-    """Check if an OCR bounding box is (mostly) inside a zone rectangle.
+def _jpeg_size(path):
+    """Return (width, height) of a JPEG by reading its SOF header.
 
-    Both are dicts with keys: left, top, right, bottom  (image-pixel coords).
-    margin: pixels of tolerance for boxes near zone edges.
+    Walks the marker segments up to the first start-of-frame instead of
+    letting PIL build an Image object.  Falls back to PIL for anything the
+    header walk doesn't understand.
     """
-    # Centre of the OCR box
-    cx = (ocr_box["left"] + ocr_box["right"]) / 2
-    cy = (ocr_box["top"] + ocr_box["bottom"]) / 2
-    return (zone["left"] - margin <= cx <= zone["right"] + margin and
-            zone["top"] - margin <= cy <= zone["bottom"] + margin)
+    try:
+        with open(path, "rb") as f:
+            if f.read(2) != b"\xff\xd8":
+                raise ValueError("not a JPEG")
+            while True:
+                if f.read(1) != b"\xff":
+                    raise ValueError("lost marker sync")
+                marker = f.read(1)
+                while marker == b"\xff":  # fill bytes
+                    marker = f.read(1)
+                if not marker:
+                    raise ValueError("no SOF marker")
+                m = marker[0]
+                if m == 0x01 or 0xD0 <= m <= 0xD8:  # standalone markers
+                    continue
+                (seg_len,) = struct.unpack(">H", f.read(2))
+                # SOF0..SOF15, except DHT (C4), JPG (C8) and DAC (CC)
+                if 0xC0 <= m <= 0xCF and m not in (0xC4, 0xC8, 0xCC):
+                    f.read(1)  # sample precision
+                    h, w = struct.unpack(">HH", f.read(4))
+                    return w, h
+                f.seek(seg_len - 2, os.SEEK_CUR)
+    except (OSError, ValueError, struct.error):
+        pass
+
+    with Image.open(path) as im:
+        return im.size
+
+
+def _zone_membership(boxes, zones, margin=10):
+    """Return a (Z, N) bool mask: which OCR boxes are (mostly) inside each zone.
+
+    A box belongs to a zone when its centre lies within the zone rectangle
+    grown by `margin` pixels.  boxes is an _OCR_BOX_DTYPE array; zones are
+    dicts with keys: left, top, right, bottom  (image-pixel coords).
+    """
+    mask = np.zeros((len(zones), len(boxes)), dtype=bool)
+    if not len(boxes) or not zones:
+        return mask
+
+    # Centres of the OCR boxes
+    cx = (boxes["left"] + boxes["right"]) / 2
+    cy = (boxes["top"] + boxes["bottom"]) / 2
+
+    rects = np.array(
+        [[z["left"] - margin, z["top"] - margin, z["right"] + margin, z["bottom"] + margin]
+         for z in zones],
+        dtype=np.float64,
+    )
+
+    if STRtree is None:
+        return ((cx[None, :] >= rects[:, 0:1]) & (cx[None, :] <= rects[:, 2:3]) &
+                (cy[None, :] >= rects[:, 1:2]) & (cy[None, :] <= rects[:, 3:4]))
+
+    # Bulk-load an R-tree over the OCR boxes once per page and query it with
+    # every zone; only the intersecting (zone, box) pairs get the centre test.
+    tree = STRtree(shapely.box(boxes["left"], boxes["top"], boxes["right"], boxes["bottom"]))
+    zone_idx, box_idx = tree.query(shapely.box(rects[:, 0], rects[:, 1], rects[:, 2], rects[:, 3]),
+                                   predicate="intersects")
+    r = rects[zone_idx]
+    keep = ((cx[box_idx] >= r[:, 0]) & (cx[box_idx] <= r[:, 2]) &
+            (cy[box_idx] >= r[:, 1]) & (cy[box_idx] <= r[:, 3]))
+    mask[zone_idx[keep], box_idx[keep]] = True
+    return mask
 
 
-def _classify_blocks(blocks, zone_height_px):
+def _classify_blocks(heights, rel_top):
     """Heuristic: label each block as headline / subheadline / body / byline.
 
-    Uses the block height (proxy for font size) and vertical position.
+    Uses the block height (proxy for font size) and vertical position
+    (rel_top: 0 = top of zone, 1 = bottom).  Both are arrays over the
+    zone's blocks; returns a matching array of role strings.
     """
-    if not blocks:
-        return blocks
+    if not len(heights):
+        return np.empty(0, dtype=object)
 
-    max_h = max(b["height"] for b in blocks)
+    max_h = heights.max()
 
-    for b in blocks:
-        h = b["height"]
-        rel_y = b["rel_top"]  # 0 = top of zone, 1 = bottom
+    is_headline = (heights >= max_h * 0.7) & (heights > 25)
+    is_subheadline = (heights >= max_h * 0.45) & (heights > 18)
+    is_byline = (rel_top > 0.92) | (heights < 12)
 
-        if h >= max_h * 0.7 and h > 25:
-            b["role"] = "headline"
-        elif h >= max_h * 0.45 and h > 18:
-            b["role"] = "subheadline"
-        elif rel_y > 0.92 or h < 12:
-            b["role"] = "byline"
-        else:
-            b["role"] = "body"
-
-    return blocks
+    # np.select picks the first matching condition, same as an if/elif chain
+    return np.select([is_headline, is_subheadline, is_byline],
+                     ["headline", "subheadline", "byline"], default="body")
 
 
 def _page_already_done(pg):
@@ -94,110 +179,266 @@ def _page_already_done(pg):
     return all("text_blocks" in a for a in articles)
 
 
+def _dump(data):
+    # orjson serialises numpy scalars/arrays natively, in C, and emits UTF-8
+    # bytes directly — much cheaper than json.dump for a growing document.
+    return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+                        | orjson.OPT_NON_STR_KEYS)
+
+
+def _save_checkpoint(data, ocr_file):
+    """Write an intermediate checkpoint to {ocr_file}.partial.
+
+    Plain overwrite, no temp file + rename: checkpoints are frequent and
+    only need to survive a crash, so they skip the rename barrier.  A torn
+    checkpoint is detected (and ignored) on resume.
+    """
+    with open(ocr_file + ".partial", "wb") as f:
+        f.write(_dump(data))
+
+
 def _save_incremental(data, ocr_file):
-    """Write the current state to disk (atomic-ish via temp file)."""
+    """Write the final state to disk (atomic-ish via temp file)."""
     tmp = ocr_file + ".tmp"
-    with open(tmp, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2, cls=_NumpyEncoder)
+    with open(tmp, "wb") as f:
+        f.write(_dump(data))
     # Rename is atomic on most filesystems
     if os.path.exists(ocr_file):
         os.replace(tmp, ocr_file)
     else:
         os.rename(tmp, ocr_file)
+    # The final file supersedes any intermediate checkpoint
+    if os.path.exists(ocr_file + ".partial"):
+        os.remove(ocr_file + ".partial")
 
 
-def _process_page(pg, images_dir, reader):
-    """Run OCR on a single page and populate text_blocks for each article."""
-    page_num = pg["page_num"]
-    img_path = os.path.join(images_dir, f"page_{page_num}.jpg")
+def _load_resume_state(ocr_file):
+    """Return the newest readable OCR state (checkpoint or final), or None."""
+    for path in (ocr_file + ".partial", ocr_file):
+        if not os.path.exists(path):
+            continue
+        try:
+            with open(path, "rb") as f:
+                data = orjson.loads(f.read())
+        except orjson.JSONDecodeError:
+            print(f"  WARN: {path} is incomplete — ignoring it.")
+            continue
+        print(f"  Found existing {path} — resuming from it.")
+        return data
+    return None
+
+
+def _page_image_size(pg, page_img_fmt):
+    """Source image (width, height), cached on the page dict after the first read.
+
+    The cached img_w / img_h are saved with the OCR checkpoints, so re-runs
+    don't touch the JPEG headers again.
+    """
+    if not (pg.get("img_w") and pg.get("img_h")):
+        pg["img_w"], pg["img_h"] = _jpeg_size(_page_image_path(pg, page_img_fmt))
+    return pg["img_w"], pg["img_h"]
+
+
+def _ocr_input_size(img_w, img_h):
+    """(n_w, n_h, px_scale): the size the detector sees a page of this size
+    at -- capped at OCR_MAX_HEIGHT -- and the factor back to source pixels."""
+    if img_h > OCR_MAX_HEIGHT:
+        px_scale = img_h / OCR_MAX_HEIGHT
+        return int(img_w / px_scale), OCR_MAX_HEIGHT, px_scale
+    return img_w, img_h, 1.0
+
 
-    if not os.path.exists(img_path):
-        print(f"  Page {page_num}: image not found, skipping")
-        return False
+def _image_digest(path):
+    """Content hash of an image file, used to OCR identical pages only once."""
+    with open(path, "rb") as f:
+        return hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+
+
+def _decode_image(path):
+    """Decode a page JPG to an RGB ndarray (libjpeg-turbo when available)."""
+    if _turbojpeg is not None:
+        with open(path, "rb") as f:
+            return _turbojpeg.decode(f.read(), pixel_format=TJPF_RGB)
+    with Image.open(path) as im:
+        return np.asarray(im.convert("RGB"))
+
+
+def _prefetch_images(path_batches, out_q):
+    """Producer thread: decode each batch of images and queue it, in order.
+
+    A decode failure is queued in place of its batch so the consumer can
+    report it against the right pages.
+    """
+    for paths in path_batches:
+        try:
+            out_q.put([_decode_image(p) for p in paths])
+        except Exception as e:
+            out_q.put(e)
 
-    # Get image dimensions for coordinate scaling
-    with Image.open(img_path) as im:
-        img_w, img_h = im.size
+
+def _ocr_boxes_array(ocr_results):
+    """Convert easyocr (corners, text, conf) results to an _OCR_BOX_DTYPE array.
+
+    One pass over the results fills preallocated corner/conf buffers; the
+    box extents then come from a single min/max reduction over all boxes.
+    """
+    n = len(ocr_results)
+    boxes = np.empty(n, dtype=_OCR_BOX_DTYPE)
+    if not n:
+        return boxes
+
+    corners = np.empty((n, 4, 2), dtype=np.float64)
+    confs = np.empty(n, dtype=np.float64)
+    texts = [None] * n
+    for i, (box_corners, text, conf) in enumerate(ocr_results):
+        corners[i] = box_corners
+        texts[i] = text
+        confs[i] = conf
+
+    mins = corners.min(axis=1)
+    maxs = corners.max(axis=1)
+    boxes["left"], boxes["top"] = mins[:, 0], mins[:, 1]
+    boxes["right"], boxes["bottom"] = maxs[:, 0], maxs[:, 1]
+    boxes["width"] = maxs[:, 0] - mins[:, 0]
+    boxes["height"] = maxs[:, 1] - mins[:, 1]
+    boxes["conf"] = confs
+    boxes["text"] = texts
+    return boxes
+
+
+class _HalfPrecision(torch.nn.Module):
+    """Run a wrapped model in FP16, converting float inputs/outputs at the edges.
+
+    Non-float arguments (e.g. the recogniser's token tensor) pass through
+    untouched, and outputs come back as float32 so the numpy/cv2 code in
+    easyocr keeps working.
+    """
+
+    def __init__(self, module):
+        super().__init__()
+        self.module = module.half()
+
+    def forward(self, *args):
+        args = [a.half() if torch.is_tensor(a) and a.is_floating_point() else a
+                for a in args]
+        out = self.module(*args)
+        if isinstance(out, tuple):
+            return tuple(o.float() if torch.is_tensor(o) else o for o in out)
+        return out.float()
+
+
+def _page_image_path(pg, page_img_fmt):
+    return page_img_fmt.format(pg["page_num"])
+
+
+def _process_page_results(pg, ocr_results, img_w, img_h, px_scale=1.0):
+    """Populate text_blocks for each article from preloaded OCR results.
+
+    img_w / img_h are the dimensions of the image the detector actually saw
+    (i.e. after readtext_batched's n_width/n_height resize), so the OCR box
+    coordinates and the scaled zones share one pixel space.  px_scale maps
+    detector pixels back to source-image pixels: block heights are stored
+    in source pixels so _classify_blocks' absolute thresholds still hold.
+    """
+    page_num = pg["page_num"]
 
     scale_x = img_w / COORD_SPACE_W
     scale_y = img_h / COORD_SPACE_H
 
-    # Run OCR on full page
-    print(f"  Page {page_num}: running OCR on {img_path} ({img_w}x{img_h})...")
-    ocr_results = reader.readtext(img_path)
-    print(f"    Found {len(ocr_results)} text blocks")
-
-    # Convert OCR results to a simpler list of dicts
-    ocr_boxes = []
-    for box_corners, text, conf in ocr_results:
-        xs = [float(pt[0]) for pt in box_corners]
-        ys = [float(pt[1]) for pt in box_corners]
-        ocr_boxes.append({
-            "left": min(xs),
-            "top": min(ys),
-            "right": max(xs),
-            "bottom": max(ys),
-            "width": max(xs) - min(xs),
-            "height": max(ys) - min(ys),
-            "text": text,
-            "conf": round(float(conf), 3),
-        })
-
-    # For each article zone, find OCR boxes that fall inside
-    for art in pg["articles"]:
-        zone_px = {
+    print(f"  Page {page_num}: found {len(ocr_results)} text blocks ({img_w}x{img_h})")
+
+    boxes = _ocr_boxes_array(ocr_results)
+
+    zones_px = [
+        {
             "left":   art["left"]  * scale_x,
             "top":    art["top"]   * scale_y,
             "right":  (art["left"] + art["width"])  * scale_x,
             "bottom": (art["top"]  + art["height"]) * scale_y,
         }
+        for art in pg["articles"]
+    ]
+    inside = _zone_membership(boxes, zones_px)
+
+    # For each article zone, collect the OCR boxes that fall inside (top to
+    # bottom), compute all derived columns at once, then emit JSON dicts.
+    for art, zone_px, zone_mask in zip(pg["articles"], zones_px, inside):
         zone_h_px = zone_px["bottom"] - zone_px["top"]
 
-        matched = []
-        for ob in ocr_boxes:
-            if _box_inside_zone(ob, zone_px):
-                matched.append({
-                    "top_pct":    round(ob["top"]    / img_h * 100, 3),
-                    "left_pct":   round(ob["left"]   / img_w * 100, 3),
-                    "width_pct":  round(ob["width"]  / img_w * 100, 3),
-                    "height_pct": round(ob["height"] / img_h * 100, 3),
-                    "rel_top": round((ob["top"] - zone_px["top"]) / zone_h_px, 3)
-                               if zone_h_px > 0 else 0,
-                    "height": round(ob["height"], 1),
-                    "ocr_text": ob["text"],
-                    "conf": ob["conf"],
-                })
-
-        matched.sort(key=lambda b: b["top_pct"])
-        _classify_blocks(matched, zone_h_px)
-        art["text_blocks"] = matched
+        idx = np.nonzero(zone_mask)[0]
+        zb = boxes[idx[np.argsort(boxes["top"][idx], kind="stable")]]
+
+        if zone_h_px > 0:
+            rel_top = np.round((zb["top"] - zone_px["top"]) / zone_h_px, 3)
+        else:
+            rel_top = np.zeros(len(zb))
+        heights = np.round(zb["height"] * px_scale, 1)
+        roles = _classify_blocks(heights, rel_top)
+
+        art["text_blocks"] = [
+            {
+                "top_pct": t, "left_pct": l, "width_pct": w, "height_pct": h,
+                "rel_top": rt, "height": hh, "ocr_text": txt, "conf": cf,
+                "role": role,
+            }
+            for t, l, w, h, rt, hh, txt, cf, role in zip(
+                np.round(zb["top"] / img_h * 100, 3).tolist(),
+                np.round(zb["left"] / img_w * 100, 3).tolist(),
+                np.round(zb["width"] / img_w * 100, 3).tolist(),
+                np.round(zb["height"] / img_h * 100, 3).tolist(),
+                rel_top.tolist(),
+                heights.tolist(),
+                zb["text"].tolist(),
+                np.round(zb["conf"], 3).tolist(),
+                roles.tolist(),
+            )
+        ]
 
     total_blocks = sum(len(a.get("text_blocks", [])) for a in pg["articles"])
     print(f"    Mapped {total_blocks} text blocks to {len(pg['articles'])} article zones")
     return True
 
 
-def run_ocr(date_str: str):
-    """Main OCR pipeline — incremental, saves after each page.
+def _finalize_page(pg, ocr_results, img_w, img_h, px_scale, data, ocr_file, checkpoint):
+    """Post-process one page's OCR results, optionally checkpointing to disk.
 
-    - If articles_ocr.json already exists, loads it and skips pages that
-      are already done (all articles have text_blocks).
-    - Saves to disk after every page so a crash never loses more than
-      the page that was being processed.
+    Runs on the post-processing worker so zone matching and JSON writes
+    overlap with the next batch on the GPU.  Returns True on success.
+    """
+    page_num = pg["page_num"]
+    ok = False
+    try:
+        _process_page_results(pg, ocr_results, img_w, img_h, px_scale)
+        ok = True
+    except Exception as e:
+        print(f"  ⚠ Page {page_num}: ERROR — {type(e).__name__}: {e}")
+        print(f"    Skipping this page, progress so far is safe.")
+
+    if checkpoint:
+        _save_checkpoint(data, ocr_file)
+        print(f"    💾 Checkpointed progress after page {page_num}")
+    return ok
+
+
+def run_ocr(date_str: str, checkpoint_interval: int = 4):
+    """Main OCR pipeline — incremental, checkpoints every few pages.
+
+    - If articles_ocr.json (or a newer .partial checkpoint) already exists,
+      loads it and skips pages that are already done (all articles have
+      text_blocks).
+    - Checkpoints to disk every `checkpoint_interval` pages so a crash
+      never loses more than that many pages; the final save is atomic.
     - Wraps each page in try/except so one bad page doesn't kill the run.
     """
-    translated_file, ocr_file, images_dir = _paths(date_str)
+    translated_file, ocr_file, page_img_fmt = _paths(date_str)
 
     if not os.path.exists(translated_file):
         print(f"  ERROR: {translated_file} not found.  Run translator.py first.")
         return
 
     # ── Resume from existing OCR file if available ──
-    if os.path.exists(ocr_file):
-        print(f"  Found existing {ocr_file} — resuming from it.")
-        with open(ocr_file, "r", encoding="utf-8") as f:
-            data = json.load(f)
-    else:
+    data = _load_resume_state(ocr_file)
+    if data is None:
         with open(translated_file, "r", encoding="utf-8") as f:
             data = json.load(f)
 
@@ -211,27 +452,116 @@ def run_ocr(date_str: str):
 
     print(f"  {len(todo)}/{len(pages)} pages still need OCR.")
 
+    # Pages without an image can't be OCR'd — report and leave them for a re-run
+    ready = []
+    for pg in todo:
+        if os.path.exists(_page_image_path(pg, page_img_fmt)):
+            ready.append(pg)
+        else:
+            print(f"  Page {pg['page_num']}: image not found, skipping")
+    if not ready:
+        print("  No page images available — nothing to OCR.")
+        return
+
+    # Batching needs a common input shape, so pages are batched with others
+    # of the same source size (usually the whole edition; inserts and
+    # supplements may differ), each group at its own capped size.
+    by_size = {}
+    for pg in ready:
+        by_size.setdefault(_page_image_size(pg, page_img_fmt), []).append(pg)
+
     # Initialise easyocr only if there's work to do
     print("  Initialising easyocr (Hindi + English)...")
-    reader = easyocr.Reader(["hi", "en"], gpu=True, verbose=False)
-
+    reader = easyocr.Reader(["hi", "en"], gpu=True, verbose=False,
+                            cudnn_benchmark=True)
+    if OCR_FP16 and torch.cuda.is_available():
+        reader.detector = _HalfPrecision(reader.detector)
+        reader.recognizer = _HalfPrecision(reader.recognizer)
+        print("  Running detector + recogniser in FP16")
+
+    # Warm-up pass so cuDNN autotuning isn't billed to the first real batch.
+    # Autotuning is per input shape, so warm up at the size most pages use.
+    if torch.cuda.is_available():
+        n_w, n_h, _ = _ocr_input_size(*max(by_size, key=lambda size: len(by_size[size])))
+        reader.readtext_batched(np.zeros([OCR_BATCH_SIZE, n_h, n_w, 3], dtype=np.uint8),
+                                n_width=n_w, n_height=n_h, batch_size=OCR_BATCH_SIZE)
+
+    checkpoint_interval = max(1, checkpoint_interval)
+    results_by_digest = {}
     processed = 0
     failed = 0
-    for pg in todo:
-        page_num = pg["page_num"]
-        try:
-            ok = _process_page(pg, images_dir, reader)
-            if ok:
+    in_flight = []
+
+    def _collect(futures):
+        nonlocal processed, failed
+        for fut in futures:
+            if fut.result():
                 processed += 1
-        except Exception as e:
-            failed += 1
-            print(f"  ⚠ Page {page_num}: ERROR — {type(e).__name__}: {e}")
-            print(f"    Skipping this page, progress so far is safe.")
-
-        # Save after every page (whether success or failure for other pages)
-        _save_incremental(data, ocr_file)
-        print(f"    💾 Saved progress ({processed} done, {failed} failed, "
-              f"{len(todo) - processed - failed} remaining)")
+            else:
+                failed += 1
+        if futures:
+            print(f"    ({processed} done, {failed} failed, "
+                  f"{len(ready) - processed - failed} remaining)")
+
+    # Plan batches up front.  Identical images (same bytes, any filename) are
+    # OCR'd once per run: only the first page carrying a digest is decoded.
+    plan = []
+    seen_digests = set()
+    planned = 0  # pages in earlier batches, for checkpoint spacing
+    for size, group in by_size.items():
+        ocr_size = _ocr_input_size(*size)
+        for start in range(0, len(group), OCR_BATCH_SIZE):
+            chunk = group[start:start + OCR_BATCH_SIZE]
+            digests = [_image_digest(_page_image_path(pg, page_img_fmt)) for pg in chunk]
+            new_digests = []
+            new_paths = []
+            for pg, digest in zip(chunk, digests):
+                if digest not in seen_digests:
+                    seen_digests.add(digest)
+                    new_digests.append(digest)
+                    new_paths.append(_page_image_path(pg, page_img_fmt))
+            plan.append((planned, ocr_size, chunk, digests, new_digests, new_paths))
+            planned += len(chunk)
+
+    # JPEG decode for the next batch runs on a producer thread while the GPU
+    # works on the current one; maxsize bounds decoded pages held in memory.
+    decoded = queue.Queue(maxsize=2)
+    threading.Thread(target=_prefetch_images,
+                     args=([p[5] for p in plan], decoded), daemon=True).start()
+
+    # A single worker keeps post-processing + saves strictly ordered (so
+    # `data` is never mutated mid-dump) while the main thread feeds the GPU.
+    # At most one finished batch waits on the worker, which bounds memory.
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        for start, (n_w, n_h, px_scale), chunk, digests, new_digests, new_paths in plan:
+            images = decoded.get()
+            print(f"  Running OCR on pages {[pg['page_num'] for pg in chunk]} ({n_w}x{n_h}, "
+                  f"{len(chunk) - len(new_paths)} reused)...")
+            try:
+                if isinstance(images, Exception):
+                    raise images
+                if images:
+                    batch = reader.readtext_batched(images, n_width=n_w, n_height=n_h,
+                                                    batch_size=OCR_BATCH_SIZE)
+                    results_by_digest.update(zip(new_digests, batch))
+                results = [results_by_digest[d] for d in digests]
+            except Exception as e:
+                failed += len(chunk)
+                print(f"  ⚠ Pages {[pg['page_num'] for pg in chunk]}: OCR ERROR — "
+                      f"{type(e).__name__}: {e}")
+                print(f"    Skipping these pages, progress so far is safe.")
+                continue
+
+            _collect(in_flight)
+            in_flight = [
+                pool.submit(_finalize_page, pg, ocr_results, n_w, n_h, px_scale, data, ocr_file,
+                            (start + j + 1) % checkpoint_interval == 0)
+                for j, (pg, ocr_results) in enumerate(zip(chunk, results))
+            ]
+
+        _collect(in_flight)
+
+    _save_incremental(data, ocr_file)
 
     # Final summary
     total_zones = sum(len(pg["articles"]) for pg in pages)
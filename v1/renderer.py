@@ -9,7 +9,9 @@ regions stay visible.
 
 import json
 import os
+from collections import namedtuple
 
+import numpy as np
 from jinja2 import Environment, FileSystemLoader
 
 DATA_DIR = "data"
@@ -24,6 +26,21 @@ COORD_SPACE_H = 2050
 CHAR_FIT_SAFETY = float(os.getenv("CHAR_FIT_SAFETY", "0.90"))
 
 
+# Read-only view records handed to the template.  Jinja resolves `x.attr`
+# with getattr first, so tuple slots skip the failed-getattr-then-getitem
+# fallback it takes for every field of a plain dict.
+_Page = namedtuple("_Page", "page_num articles")
+_ZoneArt = namedtuple(
+    "_ZoneArt",
+    "top_pct left_pct width_pct height_pct article_url "
+    "headline_en headline_hi body_en body_hi",
+)
+_OcrArt = namedtuple("_OcrArt", "regions")
+_Region = namedtuple(
+    "_Region", "role top_pct left_pct width_pct height_pct en_text avg_block_h"
+)
+
+
 def _paths(date_str: str):
     """Return date-namespaced file paths."""
     data_dir = os.path.join(DATA_DIR, date_str)
@@ -36,12 +53,21 @@ def _paths(date_str: str):
 
 def _convert_to_pct(pages):
     """Convert absolute px coordinates to percentage-based for responsive overlay."""
-    for pg in pages:
-        for art in pg.get("articles", []):
-            art["top_pct"] = art["top"] / COORD_SPACE_H * 100
-            art["left_pct"] = art["left"] / COORD_SPACE_W * 100
-            art["width_pct"] = art["width"] / COORD_SPACE_W * 100
-            art["height_pct"] = art["height"] / COORD_SPACE_H * 100
+    all_arts = [art for pg in pages for art in pg.get("articles", [])]
+    if not all_arts:
+        return
+
+    coords = np.array([[a["top"], a["left"], a["width"], a["height"]] for a in all_arts],
+                      dtype=np.float64)
+    scale = np.array([COORD_SPACE_H, COORD_SPACE_W, COORD_SPACE_W, COORD_SPACE_H],
+                     dtype=np.float64)
+    pct = coords / scale * 100
+
+    for art, (top, left, width, height) in zip(all_arts, pct.tolist()):
+        art["top_pct"] = top
+        art["left_pct"] = left
+        art["width_pct"] = width
+        art["height_pct"] = height
 
 
 def _take_text_chunk(text: str, cap: int):
@@ -480,6 +506,32 @@ def _assign_text_to_regions(art, regions):
             r["en_text"] = ""
 
 
+def _template_pages(pages, use_ocr):
+    """Convert page/article dicts to the namedtuple views the template reads."""
+    if use_ocr:
+        return [
+            _Page(pg["page_num"], [
+                _OcrArt([
+                    _Region(r["role"], r["top_pct"], r["left_pct"], r["width_pct"],
+                            r["height_pct"], r.get("en_text", ""), r["avg_block_h"])
+                    for r in art.get("regions", [])
+                ])
+                for art in pg["articles"]
+            ])
+            for pg in pages
+        ]
+    return [
+        _Page(pg["page_num"], [
+            _ZoneArt(art["top_pct"], art["left_pct"], art["width_pct"], art["height_pct"],
+                     art.get("article_url", ""),
+                     art.get("headline_en", ""), art.get("headline_hi", ""),
+                     art.get("body_en", ""), art.get("body_hi", ""))
+            for art in pg["articles"]
+        ])
+        for pg in pages
+    ]
+
+
 def render_html(date_str: str):
     """Load OCR or translated data and render to output/{date}/index.html."""
 
@@ -513,12 +565,12 @@ def render_html(date_str: str):
                 art["regions"] = regions
                 total_regions += len(regions)
 
-    env = Environment(loader=FileSystemLoader(TEMPLATE_DIR))
+    env = Environment(loader=FileSystemLoader(TEMPLATE_DIR), auto_reload=False)
     template = env.get_template("epaper.html.j2")
 
     html = template.render(
         date=date_str,
-        pages=data["pages"],
+        pages=_template_pages(data["pages"], use_ocr),
         use_ocr=use_ocr,
     )
 
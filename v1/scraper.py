@@ -5,11 +5,15 @@ Step 1: Scrape Aaj Tak epaper — extract page images, article zones, and Hindi
 import json
 import os
 import re
+import shutil
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 
+import lxml.html
 import requests
-from bs4 import BeautifulSoup
+from lxml import etree
+from requests.adapters import HTTPAdapter
 from playwright.sync_api import sync_playwright
 
 
@@ -31,14 +35,70 @@ HEADERS = {
                   "(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
 }
 
+# Concurrent HTTP fetches for page images / article pages.  All requests
+# share one keep-alive Session so TCP+TLS setup is paid once per connection.
+DOWNLOAD_WORKERS = 6
+
+
+def _make_session() -> requests.Session:
+    """Session with HEADERS and a connection pool sized for DOWNLOAD_WORKERS."""
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=8)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def _download_image(session: requests.Session, url: str, local: str):
+    """Stream one page image to `local`.  Returns a one-line status message.
+
+    Bytes go from the socket to disk in 64 KB chunks rather than being held
+    in memory as resp.content.  They land in `local + ".part"`, which is
+    renamed into place only once complete, so an interrupted download never
+    leaves a truncated image at `local`.
+    """
+    part = local + ".part"
+    try:
+        with session.get(url, stream=True, timeout=30) as resp:
+            if resp.status_code != 200:
+                return f"WARN: {url} returned {resp.status_code}"
+            resp.raw.decode_content = True
+            with open(part, "wb") as f:
+                shutil.copyfileobj(resp.raw, f, 1 << 16)
+        os.replace(part, local)
+        return f"Downloaded {local} ({os.path.getsize(local)//1024} KB)"
+    except Exception as e:
+        if os.path.exists(part):
+            os.remove(part)
+        return f"ERROR downloading {url}: {e}"
+
+
+def _fetch_article_text(session: requests.Session, url: str) -> tuple:
+    """Fetch an article page and return (headline, body).
+
+    Raises on network errors; returns None for a non-200 response.
+    """
+    resp = session.get(url, timeout=20)
+    if resp.status_code != 200:
+        print(f"      ⚠ HTTP {resp.status_code} for {url}")
+        return None
+    # Decode with the charset requests resolved (as resp.text would); left to
+    # itself lxml assumes latin-1 for bytes without a <meta charset>
+    parser = lxml.html.HTMLParser(encoding=resp.encoding or "utf-8")
+    return _extract_article_text(lxml.html.fromstring(resp.content, parser=parser))
+
+
+# The lookbehind keeps e.g. "margin-top:" or "line-height:" from matching
+_STYLE_RE = re.compile(r"(?<![-\w])(top|left|width|height)\s*:\s*([\d.]+)px")
+
 
 def parse_style(style_str: str) -> dict:
     """Extract top, left, width, height from inline style string."""
     props = {}
-    for prop in ["top", "left", "width", "height"]:
-        match = re.search(rf"{prop}:\s*([\d.]+)px", style_str)
-        if match:
-            props[prop] = float(match.group(1))
+    # Single pass over the string; first occurrence of each property wins
+    for m in _STYLE_RE.finditer(style_str):
+        props.setdefault(m.group(1), float(m.group(2)))
     return props
 
 
@@ -56,6 +116,9 @@ def scrape_epaper(date_str: str):
     os.makedirs(data_dir, exist_ok=True)
     os.makedirs(images_dir, exist_ok=True)
 
+    # Local page-image path template, formatted per page
+    local_fmt = os.path.join(images_dir, "page_{}.jpg")
+
     # ── Step 1: Load the epaper page with Playwright (JS-rendered) ──
     print("  Loading epaper.aajtak.in with headless browser...")
     with sync_playwright() as p:
@@ -89,17 +152,17 @@ def scrape_epaper(date_str: str):
         html = page.content()
         browser.close()
 
-    soup = BeautifulSoup(html, "lxml")
+    tree = lxml.html.fromstring(html)
 
     # ── Step 2: Parse the carousel slides ──
-    container = soup.find(id="ImageContainer")
-    if not container:
+    containers = _XP_CONTAINER(tree)
+    if not containers:
         print("  ERROR: Could not find #ImageContainer. Dumping HTML for debug.")
         with open(os.path.join(data_dir, "debug_epaper.html"), "w", encoding="utf-8") as f:
             f.write(html)
         return
 
-    slides = container.find_all("li", class_="mySlides")
+    slides = _XP_SLIDES(containers[0])
     print(f"  Found {len(slides)} page slides")
 
     pages = []
@@ -108,12 +171,12 @@ def scrape_epaper(date_str: str):
 
     for page_idx, slide in enumerate(slides, start=1):
         # ── Get page image URL ──
-        img_tag = slide.find("img")
-        if not img_tag:
+        img_tags = _XP_IMG(slide)
+        if not img_tags:
             print(f"  Page {page_idx}: no <img> found, skipping")
             continue
 
-        image_url = img_tag.get("src") or img_tag.get("data-src") or ""
+        image_url = img_tags[0].get("src") or img_tags[0].get("data-src") or ""
         if not image_url.startswith("http"):
             # Build from pattern
             image_url = (
@@ -121,10 +184,10 @@ def scrape_epaper(date_str: str):
                 f"epaperimages/{ddmmyyyy}/{ddmmyyyy}-md-hr-{page_idx}.jpg"
             )
 
-        image_local = os.path.join(images_dir, f"page_{page_idx}.jpg")
+        image_local = local_fmt.format(page_idx)
 
         # ── Parse pagerectangle article zones ──
-        rectangles = slide.find_all("div", class_="pagerectangle")
+        rectangles = _XP_RECTS(slide)
         articles = []
         zones_kept = []
 
@@ -150,7 +213,7 @@ def scrape_epaper(date_str: str):
                 continue
 
             # Check if video zone (contains SVG)
-            if rect.find("svg"):
+            if _XP_SVG(rect):
                 zones_kept.append({
                     "type": "video",
                     "top": coords["top"],
@@ -191,25 +254,20 @@ def scrape_epaper(date_str: str):
 
         print(f"  Page {page_idx}: {len(articles)} articles, {len(zones_kept)} ad/video zones")
 
+    session = _make_session()
+
     # ── Step 3: Download page images ──
     print("\n  Downloading page images...")
-    for pg in pages:
-        url = pg["image_url"]
-        local = pg["image_local"]
-        if os.path.exists(local):
-            print(f"    {local} already exists, skipping")
-            continue
-        try:
-            resp = requests.get(url, headers=HEADERS, timeout=30)
-            if resp.status_code == 200:
-                with open(local, "wb") as f:
-                    f.write(resp.content)
-                print(f"    Downloaded {local} ({len(resp.content)//1024} KB)")
-            else:
-                print(f"    WARN: {url} returned {resp.status_code}")
-        except Exception as e:
-            print(f"    ERROR downloading {url}: {e}")
-        time.sleep(0.3)
+    with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as pool:
+        futures = []
+        for pg in pages:
+            local = pg["image_local"]
+            if os.path.exists(local):
+                print(f"    {local} already exists, skipping")
+                continue
+            futures.append(pool.submit(_download_image, session, pg["image_url"], local))
+        for fut in as_completed(futures):
+            print(f"    {fut.result()}")
 
     # ── Step 4: Fetch article Hindi text ──
     unique_articles = {}
@@ -220,26 +278,31 @@ def scrape_epaper(date_str: str):
                 unique_articles[sid] = art
 
     print(f"\n  Fetching Hindi text for {len(unique_articles)} unique articles...")
-    for i, (sid, art) in enumerate(unique_articles.items(), 1):
-        url = art["article_url"]
-        print(f"    [{i}/{len(unique_articles)}] {url}")
-        try:
-            resp = requests.get(url, headers=HEADERS, timeout=20)
-            if resp.status_code == 200:
-                art_soup = BeautifulSoup(resp.text, "lxml")
-                headline, body = _extract_article_text(art_soup)
-                art["headline_hi"] = headline
-                art["body_hi"] = body
-                article_text_cache[sid] = {"headline_hi": headline, "body_hi": body}
-                if headline:
-                    print(f"      ✓ headline: {headline[:60]}...")
-                else:
-                    print(f"      ⚠ no headline found")
+    with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as pool:
+        futures = {
+            pool.submit(_fetch_article_text, session, art["article_url"]): sid
+            for sid, art in unique_articles.items()
+        }
+        for i, fut in enumerate(as_completed(futures), 1):
+            sid = futures[fut]
+            art = unique_articles[sid]
+            print(f"    [{i}/{len(unique_articles)}] {art['article_url']}")
+            try:
+                text = fut.result()
+            except Exception as e:
+                print(f"      ✗ Error: {e}")
+                continue
+            if text is None:
+                continue
+            headline, body = text
+            art["headline_hi"] = headline
+            art["body_hi"] = body
+            article_text_cache[sid] = {"headline_hi": headline, "body_hi": body}
+            if headline:
+                print(f"      ✓ headline: {headline[:60]}...")
             else:
-                print(f"      ⚠ HTTP {resp.status_code}")
-        except Exception as e:
-            print(f"      ✗ Error: {e}")
-        time.sleep(0.5)
+                print(f"      ⚠ no headline found")
+    session.close()
 
     # Fill in text for duplicate storyids (zones that appear on multiple pages)
     for pg in pages:
@@ -254,7 +317,7 @@ def scrape_epaper(date_str: str):
         "date": date_str,
         "pages": pages,
     }
-    out_path = os.path.join(data_dir, "articles_raw.json")
+    out_path = raw_file
     with open(out_path, "w", encoding="utf-8") as f:
         json.dump(output, f, ensure_ascii=False, indent=2)
 
@@ -268,52 +331,70 @@ def scrape_epaper(date_str: str):
     print(f"  Articles with text: {total_with_text}")
 
 
-def _extract_article_text(soup: BeautifulSoup) -> tuple:
+def _css_class(tag: str, cls: str) -> str:
+    """XPath equivalent of the CSS selector `tag.cls` (descendant search)."""
+    return f"//{tag}[contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')]"
+
+
+# Epaper carousel selectors, compiled once.
+_XP_CONTAINER = etree.XPath("//*[@id='ImageContainer']")
+_XP_SLIDES = etree.XPath(".//li[contains(concat(' ', normalize-space(@class), ' '), ' mySlides ')]")
+_XP_RECTS = etree.XPath(".//div[contains(concat(' ', normalize-space(@class), ' '), ' pagerectangle ')]")
+_XP_IMG = etree.XPath(".//img")
+_XP_SVG = etree.XPath(".//svg")
+
+# Article-page selectors, compiled once.  Each list is tried in priority order.
+_XP_HEADLINE = [etree.XPath(xp) for xp in (
+    _css_class("p", "haedlinesstory"),  # note: their typo, not ours
+    _css_class("*", "headline_textview"),
+    "//h1",
+    _css_class("*", "story-headline"),
+)]
+_XP_BODY = [etree.XPath(xp) for xp in (
+    _css_class("div", "body_text_main"),
+    _css_class("*", "mid_content"),
+    _css_class("*", "body_content"),
+    _css_class("*", "story-content"),
+    "//article",
+)]
+_XP_PARAGRAPHS = etree.XPath(".//p")
+_XP_TEXT = etree.XPath(".//text()")
+
+
+def _text(el) -> str:
+    """Concatenate an element's text nodes, each stripped (like get_text(strip=True))."""
+    return "".join(t.strip() for t in _XP_TEXT(el))
+
+
+def _extract_article_text(tree) -> tuple:
     """
     Extract headline and body text from an Aaj Tak epaper article page.
+    `tree` is the lxml.html root of the page.
     Returns (headline_str, body_str).
     """
     headline = ""
     body = ""
 
-    # Headline: <p class="haedlinesstory"> (note: their typo, not ours)
-    el = soup.select_one("p.haedlinesstory")
-    if el:
-        headline = el.get_text(strip=True)
-
-    # Fallback headline selectors
-    if not headline:
-        for sel in [".headline_textview", "h1", ".story-headline"]:
-            el = soup.select_one(sel)
-            if el and el.get_text(strip=True):
-                headline = el.get_text(strip=True)
+    # Headline: <p class="haedlinesstory">, then fallback selectors
+    for xp in _XP_HEADLINE:
+        found = xp(tree)
+        if found:
+            headline = _text(found[0])
+            if headline:
                 break
 
-    # Body: all <p> tags inside <div class="body_text_main">
-    body_div = soup.select_one("div.body_text_main")
-    if body_div:
-        paragraphs = body_div.find_all("p")
+    # Body: all <p> tags inside <div class="body_text_main">, then fallbacks
+    for xp in _XP_BODY:
+        found = xp(tree)
+        if not found:
+            continue
+        paragraphs = [_text(p) for p in _XP_PARAGRAPHS(found[0])]
         if paragraphs:
-            body = "\n\n".join(
-                p.get_text(strip=True) for p in paragraphs if p.get_text(strip=True)
-            )
+            body = "\n\n".join(p for p in paragraphs if p)
         else:
-            body = body_div.get_text(strip=True)
-
-    # Fallback body selectors
-    if not body:
-        for sel in [".mid_content", ".body_content", ".story-content", "article"]:
-            el = soup.select_one(sel)
-            if el:
-                paragraphs = el.find_all("p")
-                if paragraphs:
-                    body = "\n\n".join(
-                        p.get_text(strip=True) for p in paragraphs if p.get_text(strip=True)
-                    )
-                else:
-                    body = el.get_text(strip=True)
-                if body:
-                    break
+            body = _text(found[0])
+        if body:
+            break
 
     return headline, body
 
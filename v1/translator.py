@@ -1,22 +1,79 @@
 """
 Step 2: Translate articles from Hindi to English using Groq Cloud API.
+
+Run from the repo root as a module (it imports the shared translate_core):
+    python -m v1.translator YYYY-MM-DD [--batch]
 """
 
-import json
+import asyncio
+import hashlib
+import io
 import os
 import re
+import sqlite3
 import time
+from collections import deque
+from functools import lru_cache
 
+import orjson
 from dotenv import load_dotenv
-from openai import OpenAI
+from openai import AsyncOpenAI
+
+from translate_core import TokenBucket, make_client, parse_retry_seconds, strip_fence
+
+try:
+    import ijson
+except ImportError:  # optional — fall back to loading the whole file
+    ijson = None
+
+try:
+    import tiktoken
+    _ENC = tiktoken.get_encoding("cl100k_base")
+except (ImportError, OSError):  # optional / offline — fall back to character counts
+    _ENC = None
 
 load_dotenv()
 
 DATA_DIR = "data"
 
-# Truncate very long article bodies to avoid exceeding model token limits.
-# ~2000 Hindi characters ≈ 800-1000 tokens; keeps well within context window.
+MODEL = "openai/gpt-oss-20b"
+
+# Bodies longer than this are not truncated but split at paragraph (or
+# sentence) boundaries into chunks of ~BODY_CHUNK_TOKENS, translated
+# concurrently alongside a separate headline request.  Counted in tokens when
+# tiktoken is available, so short Devanagari bodies aren't split early;
+# MAX_BODY_CHARS is the fallback without it.
+MAX_BODY_TOKENS = 3000
 MAX_BODY_CHARS = 3000
+BODY_CHUNK_TOKENS = 1500
+# Max requests in flight for a single long article, so one huge story
+# doesn't take every slot the rate limiter hands out.
+LONG_ARTICLE_FANOUT = 4
+
+# Number of translation requests in flight at once.  The workload is pure
+# network wait, so overlapping requests gives near-linear speedup up to the
+# provider's rate limit.  The limit adapts (AIMD) between these bounds:
+# +0.5 while recent latency stays under target, halved on 429/5xx/timeouts.
+CONCURRENCY_MIN = 2
+CONCURRENCY_MAX = 32
+LATENCY_TARGET = 3.0     # seconds, mean over the window
+LATENCY_WINDOW = 20      # number of recent requests averaged
+
+# Provider rate limits (Groq free tier).  Requests are paced by token buckets
+# sized to these so we run at the ceiling without tripping 429s.
+RATE_LIMIT_RPM = 30      # requests per minute
+RATE_LIMIT_TPM = 6000    # tokens per minute
+
+# Each finished translation is committed to the SQLite memory; the full
+# articles_translated.json is only rewritten every SAVE_EVERY successes and at
+# the end.  Output is compact unless TRANSLATE_PRETTY=1.
+SAVE_EVERY = 50
+TRANSLATE_PRETTY = os.getenv("TRANSLATE_PRETTY", "0") == "1"
+
+# Batch API mode (--batch): the whole edition is submitted as one job, at
+# half the price and on a separate rate-limit pool, with results within
+# the 24h completion window.  Status is polled every BATCH_POLL_SECONDS.
+BATCH_POLL_SECONDS = 60
 
 
 def _paths(date_str: str):
@@ -24,7 +81,9 @@ def _paths(date_str: str):
     data_dir = os.path.join(DATA_DIR, date_str)
     raw_file = os.path.join(data_dir, "articles_raw.json")
     translated_file = os.path.join(data_dir, "articles_translated.json")
-    return raw_file, translated_file
+    # Shared by every date: the same story often reappears in later editions
+    db_file = os.path.join(DATA_DIR, "translations.db")
+    return raw_file, translated_file, db_file
 
 
 TRANSLATION_PROMPT = """You are a professional Hindi-to-English newspaper translator.
@@ -50,35 +109,164 @@ Respond ONLY with this JSON (no other text):
 }}"""
 
 
-MAX_RETRIES = 5          # max retries on 429 / transient errors
-INITIAL_BACKOFF = 2      # seconds — doubles each retry
+# Articles packed into one request.  The instruction header is sent once per
+# batch and round trips drop by BATCH_SIZE; a batch whose reply can't be
+# matched back falls back to one request per missing article.
+BATCH_SIZE = 5
+
+BATCH_TRANSLATION_PROMPT = """You are a professional Hindi-to-English newspaper translator.
+Translate each of the following Hindi newspaper articles into polished, 
+editorially fluent English that reads like a reputable English 
+daily newspaper (like Times of India or The Hindu).
+
+Rules:
+- Keep proper nouns as-is (names, places, party names)
+- Preserve the journalistic tone and urgency
+- Do not add or remove information
+- Paragraph breaks must be preserved
+
+Translate each article's HEADLINE and BODY separately.
+
+ARTICLES (JSON list):
+{articles_json}
 
+Respond ONLY with a JSON list containing one object per article, with the
+same "id" values (no other text):
+[
+  {{"id": "...", "headline_en": "...", "body_en": "..."}}
+]"""
 
-class DailyLimitExhausted(Exception):
-    """Raised when the daily token quota is exhausted."""
-    pass
 
+def _split_template(template: str, *fields: str) -> list[str]:
+    """Split a str.format template at its `{field}` placeholders, once, so
+    prompts can be built with a plain join (no format-string parsing per call)."""
+    parts = []
+    rest = template
+    for field in fields:
+        head, rest = rest.split("{" + field + "}")
+        parts.append(head)
+    parts.append(rest)
+    return [p.replace("{{", "{").replace("}}", "}") for p in parts]
 
-def _parse_retry_seconds(error_str: str) -> int | None:
-    """Extract 'try again in XmYs' from Groq error message → total seconds."""
-    m = re.search(r'try again in (\d+)m([\d.]+)s', error_str, re.IGNORECASE)
-    if m:
-        return int(m.group(1)) * 60 + int(float(m.group(2)))
-    m = re.search(r'try again in ([\d.]+)s', error_str, re.IGNORECASE)
-    if m:
-        return int(float(m.group(1)))
-    return None
+
+_P_PREFIX, _P_MID, _P_SUFFIX = _split_template(
+    TRANSLATION_PROMPT, "hindi_headline", "hindi_body")
+_BP_PREFIX, _BP_SUFFIX = _split_template(BATCH_TRANSLATION_PROMPT, "articles_json")
+
+
+HEADLINE_TRANSLATION_PROMPT = """You are a professional Hindi-to-English newspaper translator.
+Translate the following Hindi newspaper headline into a polished English
+headline as a reputable English daily (like Times of India or The Hindu)
+would print it. Keep proper nouns as-is; do not add or remove information.
+
+HEADLINE (Hindi): {hindi_headline}
+
+Respond ONLY with this JSON (no other text):
+{{
+  "headline_en": "..."
+}}"""
+
+BODY_CHUNK_TRANSLATION_PROMPT = """You are a professional Hindi-to-English newspaper translator.
+Translate the following passage of a Hindi newspaper article into polished, 
+editorially fluent English that reads like a reputable English 
+daily newspaper (like Times of India or The Hindu).
+
+Rules:
+- Keep proper nouns as-is (names, places, party names)
+- Preserve the journalistic tone and urgency
+- Do not add or remove information
+- Paragraph breaks must be preserved
+
+PASSAGE (Hindi): {hindi_body}
+
+Respond ONLY with this JSON (no other text):
+{{
+  "body_en": "..."
+}}"""
+
+_HP_PREFIX, _HP_SUFFIX = _split_template(HEADLINE_TRANSLATION_PROMPT, "hindi_headline")
+_CP_PREFIX, _CP_SUFFIX = _split_template(BODY_CHUNK_TRANSLATION_PROMPT, "hindi_body")
+
+
+class AIMDConcurrency:
+    """Async concurrency limiter whose limit follows additive-increase /
+    multiplicative-decrease on observed request latency and overload errors.
+
+    Use as `async with controller:` around each request, and report outcomes
+    via record_success() / record_overload().
+    """
+
+    def __init__(self, c_min: int = CONCURRENCY_MIN, c_max: int = CONCURRENCY_MAX,
+                 latency_target: float = LATENCY_TARGET, window: int = LATENCY_WINDOW):
+        self.c_min = c_min
+        self.c_max = c_max
+        self.latency_target = latency_target
+        self.limit = float(c_min)
+        self.latencies = deque(maxlen=window)
+        self.in_flight = 0
+        self._cond = asyncio.Condition()
+
+    async def __aenter__(self):
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+        return self
+
+    async def __aexit__(self, *exc):
+        async with self._cond:
+            self.in_flight -= 1
+            self._cond.notify_all()
+
+    def record_success(self, latency: float):
+        self.latencies.append(latency)
+        mean_latency = sum(self.latencies) / len(self.latencies)
+        if mean_latency <= self.latency_target:
+            self._set_limit(min(self.c_max, self.limit + 0.5))
+
+    def record_overload(self):
+        self._set_limit(max(self.c_min, self.limit * 0.5))
+
+    def _set_limit(self, limit: float):
+        grew = int(limit) > int(self.limit)
+        self.limit = limit
+        if grew:
+            # Wake waiters for the newly opened slots (runs on the event loop)
+            asyncio.ensure_future(self._notify())
+
+    async def _notify(self):
+        async with self._cond:
+            self._cond.notify_all()
+
+
+def _is_overload_error(e: Exception) -> bool:
+    """True for 429 / 5xx / timeout errors, which should shrink concurrency."""
+    status = getattr(e, "status_code", None)
+    if status is not None:
+        return status == 429 or status >= 500
+    msg = str(e).lower()
+    return "429" in msg or "rate limit" in msg or "timed out" in msg or "timeout" in msg
 
 
-# Maximum seconds we're willing to wait for a daily limit reset
-MAX_DAILY_WAIT = 900  # 15 minutes
+def _estimate_tokens(prompt: str) -> int:
+    """Rough prompt + completion token count (Devanagari is ~2 chars/token)."""
+    if _ENC is not None:
+        return 2 * len(_ENC.encode(prompt))
+    return len(prompt) // 2
+
+
+# Patterns used by _extract_json, compiled once at import
+_RE_OUTER = re.compile(r'\{[^{}]*"headline_en"[^{}]*\}', re.DOTALL)
+_RE_BROAD = re.compile(r'\{.*\}', re.DOTALL)
+_RE_HL = re.compile(r'"headline_en"\s*:\s*"((?:[^"\\]|\\.)*)"', re.DOTALL)
+_RE_BD = re.compile(r'"body_en"\s*:\s*"((?:[^"\\]|\\.)*)"', re.DOTALL)
+_RE_ARRAY = re.compile(r'\[.*\]', re.DOTALL)
 
 
 def _extract_json(text: str) -> dict | None:
     """Robustly extract a JSON object from potentially messy model output.
 
     Tries, in order:
-      1. Direct json.loads on the whole string
+      1. Direct orjson.loads on the whole string
       2. Strip markdown code fences (```json ... ``` or ``` ... ```
       3. Regex: find the first { ... } block that parses as JSON
       4. Regex: look for "headline_en" and "body_en" values and build dict
@@ -86,44 +274,47 @@ def _extract_json(text: str) -> dict | None:
     """
     if not text:
         return None
+    result = _extract_json_cached(text)
+    # Callers may mutate the dict; never hand out the cached instance
+    return dict(result) if isinstance(result, dict) else result
 
+
+@lru_cache(maxsize=128)
+def _extract_json_cached(text: str) -> dict | None:
     # 1. Try direct parse
     try:
-        return json.loads(text)
-    except json.JSONDecodeError:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError:
         pass
 
-    # 2. Strip markdown code fences
-    cleaned = text
-    if "```json" in cleaned:
-        cleaned = cleaned.split("```json", 1)[1].split("```", 1)[0].strip()
-    elif "```" in cleaned:
-        cleaned = cleaned.split("```", 1)[1].split("```", 1)[0].strip()
-    try:
-        return json.loads(cleaned)
-    except json.JSONDecodeError:
-        pass
+    # 2. Strip markdown code fences -- pointless if the reply is a bare object
+    stripped = text.strip()
+    if not (stripped.startswith("{") and stripped.endswith("}")):
+        try:
+            return orjson.loads(strip_fence(text))
+        except orjson.JSONDecodeError:
+            pass
 
     # 3. Regex: find the outermost { ... } containing our keys
     #    Use a greedy match for the last } to handle nested braces
-    match = re.search(r'\{[^{}]*"headline_en"[^{}]*\}', text, re.DOTALL)
+    match = _RE_OUTER.search(text)
     if match:
         try:
-            return json.loads(match.group())
-        except json.JSONDecodeError:
+            return orjson.loads(match.group())
+        except orjson.JSONDecodeError:
             pass
 
     # Broader: first { to last }
-    match = re.search(r'\{.*\}', text, re.DOTALL)
+    match = _RE_BROAD.search(text)
     if match:
         try:
-            return json.loads(match.group())
-        except json.JSONDecodeError:
+            return orjson.loads(match.group())
+        except orjson.JSONDecodeError:
             pass
 
     # 4. Last resort: extract values with regex
-    hl_match = re.search(r'"headline_en"\s*:\s*"((?:[^"\\]|\\.)*)"', text, re.DOTALL)
-    bd_match = re.search(r'"body_en"\s*:\s*"((?:[^"\\]|\\.)*)"', text, re.DOTALL)
+    hl_match = _RE_HL.search(text)
+    bd_match = _RE_BD.search(text)
     if hl_match:
         headline = hl_match.group(1).replace('\\"', '"')
         body = bd_match.group(1).replace('\\"', '"') if bd_match else ""
@@ -132,177 +323,716 @@ def _extract_json(text: str) -> dict | None:
     return None
 
 
-def _call_api_with_retry(client, prompt: str) -> str:
-    """Call the Groq API. On any 429 / rate-limit error, just raise immediately."""
+def _extract_json_array(text: str) -> list | None:
+    """Extract the JSON list from a batched reply (bare, fenced, or embedded)."""
+    if not text:
+        return None
+    candidates = [text, strip_fence(text)]
+    match = _RE_ARRAY.search(text)
+    if match:
+        candidates.append(match.group())
+    for candidate in candidates:
+        try:
+            result = orjson.loads(candidate)
+        except orjson.JSONDecodeError:
+            continue
+        if isinstance(result, list):
+            return result
+    return None
+
+
+def _body_for_api(body_hi: str) -> tuple[str, bool]:
+    """Truncate very long bodies to avoid token limit issues.
+
+    Returns (body, truncated).
+    """
+    body_for_api = body_hi or "(no body text)"
+    if _ENC is not None:
+        toks = _ENC.encode(body_for_api)
+        if len(toks) > MAX_BODY_TOKENS:
+            # A cut inside a multi-token character decodes to U+FFFD
+            body_for_api = _ENC.decode(toks[:MAX_BODY_TOKENS]).rstrip("\ufffd") + "..."
+            return body_for_api, True
+    elif len(body_for_api) > MAX_BODY_CHARS:
+        return body_for_api[:MAX_BODY_CHARS] + "...", True
+    return body_for_api, False
+
+
+def _json_reply_complete(text: str, opener: str, closer: str) -> bool:
+    """True once the streamed reply holds a complete JSON value opened by
+    `opener` -- i.e. the model has nothing left to say that we need."""
+    start = text.find(opener)
+    end = text.rfind(closer)
+    if start < 0 or end < start:
+        return False
     try:
-        response = client.chat.completions.create(
-            model="openai/gpt-oss-20b",
+        orjson.loads(text[start:end + 1])
+    except orjson.JSONDecodeError:
+        return False
+    return True
+
+
+def _single_reply_complete(text: str) -> bool:
+    if '"headline_en"' not in text or '"body_en"' not in text:
+        return False
+    return _json_reply_complete(text, "{", "}")
+
+
+def _batch_reply_complete(text: str) -> bool:
+    return _json_reply_complete(text, "[", "]")
+
+
+def _headline_reply_complete(text: str) -> bool:
+    return '"headline_en"' in text and _json_reply_complete(text, "{", "}")
+
+
+def _body_reply_complete(text: str) -> bool:
+    return '"body_en"' in text and _json_reply_complete(text, "{", "}")
+
+
+def _count_tokens(text: str) -> int:
+    if _ENC is not None:
+        return len(_ENC.encode(text))
+    return len(text) // 2
+
+
+def _is_long_body(body_hi: str) -> bool:
+    """True if the body would be truncated as a single request."""
+    if not body_hi:
+        return False
+    if _ENC is not None:
+        return len(_ENC.encode(body_hi)) > MAX_BODY_TOKENS
+    return len(body_hi) > MAX_BODY_CHARS
+
+
+# Sentence ends: Devanagari danda or ?/!, followed by whitespace
+_RE_SENTENCE = re.compile(r'(?<=[।?!])\s+')
+
+
+def _group_units(units: list[str], sep: str, max_tokens: int) -> list[str]:
+    """Greedily join consecutive units with `sep` into chunks of <= max_tokens."""
+    chunks, cur, cur_toks = [], [], 0
+    for unit in units:
+        n = _count_tokens(unit)
+        if cur and cur_toks + n > max_tokens:
+            chunks.append(sep.join(cur))
+            cur, cur_toks = [], 0
+        cur.append(unit)
+        cur_toks += n
+    if cur:
+        chunks.append(sep.join(cur))
+    return chunks
+
+
+def _split_body(body_hi: str, max_tokens: int = BODY_CHUNK_TOKENS) -> list[str]:
+    """Split a long body into chunks at paragraph boundaries, falling back to
+    sentence boundaries inside paragraphs that are too long on their own."""
+    units = []
+    for para in body_hi.split("\n\n"):
+        if _count_tokens(para) > max_tokens:
+            units.extend(_group_units(_RE_SENTENCE.split(para), " ", max_tokens))
+        else:
+            units.append(para)
+    return _group_units(units, "\n\n", max_tokens)
+
+
+async def _call_api(client, prompt: str, rpm_bucket: TokenBucket,
+                    tpm_bucket: TokenBucket, controller: AIMDConcurrency,
+                    is_complete=None) -> str:
+    """Call the Groq API, paced by the rate-limit buckets.
+
+    The completion is streamed; once `is_complete(reply_so_far)` holds, the
+    stream is closed without waiting for the model's trailing tokens.
+
+    On a 429 / rate-limit error the buckets are drained for the advertised
+    retry-after so queued requests back off together, then the error is raised.
+    Latency and overload errors are reported to the concurrency controller.
+    """
+    await rpm_bucket.acquire(1)
+    await tpm_bucket.acquire(_estimate_tokens(prompt))
+    try:
+        start = time.monotonic()
+        stream = await client.chat.completions.create(
+            model=MODEL,
             messages=[{"role": "user", "content": prompt}],
             temperature=0.3,
             max_tokens=4096,
+            stream=True,
         )
-        return response.choices[0].message.content.strip()
+        buf = io.StringIO()
+        try:
+            async for event in stream:
+                if not event.choices:
+                    continue
+                delta = event.choices[0].delta.content
+                if not delta:
+                    continue
+                buf.write(delta)
+                # Only a chunk that could close the JSON is worth a full check
+                if is_complete is not None and ("}" in delta or "]" in delta) \
+                        and is_complete(buf.getvalue()):
+                    break
+        finally:
+            await stream.close()
+        controller.record_success(time.monotonic() - start)
+        return buf.getvalue().strip()
     except Exception as e:
+        if _is_overload_error(e):
+            controller.record_overload()
+        retry_seconds = parse_retry_seconds(str(e))
+        if retry_seconds is not None:
+            rpm_bucket.penalize(retry_seconds)
+            tpm_bucket.penalize(retry_seconds)
         raise
 
 
 def translate_articles(date_str: str):
     """Load raw articles, translate via Groq Cloud, save translated JSON."""
+    asyncio.run(_translate_articles(date_str, _translate_realtime))
 
-    raw_file, translated_file = _paths(date_str)
+
+def translate_articles_batch(date_str: str):
+    """Like translate_articles, but through the provider's Batch API.
+
+    For non-urgent runs: cheaper and not subject to the real-time rate
+    limits, but blocks until the job finishes (up to 24h).
+    """
+    asyncio.run(_translate_articles(date_str, _translate_batch_job))
+
+
+async def _translate_articles(date_str: str, run):
+    """Set up the API client and translation memory, then `await run(...)`."""
+    raw_file, translated_file, db_file = _paths(date_str)
 
     api_key = os.getenv("GROQ_API_KEY")
     if not api_key or api_key.startswith("your_"):
         print("  ERROR: Set GROQ_API_KEY in .env file")
         return
 
-    client = OpenAI(
-        api_key=api_key,
-        base_url="https://api.groq.com/openai/v1",
-    )
-
     # Load raw data
     if not os.path.exists(raw_file):
         print(f"  ERROR: {raw_file} not found. Run scraper.py first.")
         return
 
-    with open(raw_file, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    client = make_client(api_key)
+    conn = _open_memory(db_file)
+    _seed_memory(conn, translated_file)
+    try:
+        await run(date_str, client, conn)
+    finally:
+        conn.close()
+        await client.close()
+
+
+def _iter_pages(raw_file: str):
+    """Yield page dicts from articles_raw.json one at a time.
+
+    With ijson the file is parsed incrementally, so translation requests can
+    start as soon as the first page is read.
+    """
+    with open(raw_file, "rb") as f:
+        if ijson is not None:
+            yield from ijson.items(f, "pages.item", use_float=True)
+        else:
+            yield from orjson.loads(f.read())["pages"]
+
 
-    # Check if we have a partial translation to resume from
-    existing_translations = {}
-    if os.path.exists(translated_file):
-        with open(translated_file, "r", encoding="utf-8") as f:
-            existing = json.load(f)
-        # Build cache of already-translated storyids
+def _content_key(headline_hi: str, body_hi: str) -> bytes:
+    """Hash of an article's Hindi text, so reprinted stories under a new
+    storyid reuse the earlier translation."""
+    text = (headline_hi or "") + "\x1f" + (body_hi or "")
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+
+def _open_memory(db_file: str) -> sqlite3.Connection:
+    """Open the cross-run translation memory (created on first use)."""
+    conn = sqlite3.connect(db_file)
+    # WAL lets runs for other dates read while this one writes
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS tr("
+        "sid TEXT PRIMARY KEY, content_hash BLOB, headline_en TEXT, body_en TEXT)"
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_hash ON tr(content_hash)")
+    return conn
+
+
+# Stay well under SQLite's host-parameter limit in IN (...) lookups
+_SQL_CHUNK = 500
+
+
+def _lookup_memory(conn: sqlite3.Connection, sids: list, keys: list) -> tuple[dict, dict]:
+    """Batched lookup by storyid and by content hash.
+
+    Returns ({sid_str: (content_hash, translation)}, {content_hash: translation}).
+    """
+    by_sid, by_key = {}, {}
+    for k in range(0, len(sids), _SQL_CHUNK):
+        chunk = sids[k:k + _SQL_CHUNK]
+        rows = conn.execute(
+            f"SELECT sid, content_hash, headline_en, body_en FROM tr "
+            f"WHERE sid IN ({','.join('?' * len(chunk))})",
+            chunk,
+        )
+        for sid, key, headline_en, body_en in rows:
+            by_sid[sid] = (key, {"headline_en": headline_en, "body_en": body_en})
+    for k in range(0, len(keys), _SQL_CHUNK):
+        chunk = keys[k:k + _SQL_CHUNK]
+        rows = conn.execute(
+            f"SELECT content_hash, headline_en, body_en FROM tr "
+            f"WHERE content_hash IN ({','.join('?' * len(chunk))})",
+            chunk,
+        )
+        for key, headline_en, body_en in rows:
+            by_key[key] = {"headline_en": headline_en, "body_en": body_en}
+    return by_sid, by_key
+
+
+def _seed_memory(conn: sqlite3.Connection, translated_file: str):
+    """Import the real translations in an existing articles_translated.json.
+
+    Dates translated before the memory existed only have their results in
+    that file; without this the first run after upgrading would send every
+    one of them to the API again.  Storyids already in the memory are left
+    as they are.
+    """
+    if not os.path.exists(translated_file):
+        return
+    with open(translated_file, "rb") as f:
+        existing = orjson.loads(f.read())
+    rows = [
+        (str(art["storyid"]), _content_key(art.get("headline_hi", ""), art.get("body_hi", "")),
+         art["headline_en"], art.get("body_en", ""))
+        for pg in existing.get("pages", [])
+        for art in pg.get("articles", [])
         # Only cache if the English text differs from Hindi (i.e. real translation)
-        for pg in existing.get("pages", []):
-            for art in pg.get("articles", []):
-                if art.get("headline_en") and art["headline_en"] != art.get("headline_hi", ""):
-                    existing_translations[art["storyid"]] = {
-                        "headline_en": art["headline_en"],
-                        "body_en": art["body_en"],
-                    }
-        print(f"  Found {len(existing_translations)} already-translated articles (cache)")
+        if art.get("headline_en") and art["headline_en"] != art.get("headline_hi", "")
+    ]
+    before = conn.total_changes
+    conn.executemany(
+        "INSERT OR IGNORE INTO tr(sid, content_hash, headline_en, body_en) VALUES (?, ?, ?, ?)",
+        rows,
+    )
+    conn.commit()
+    if conn.total_changes > before:
+        print(f"  Imported {conn.total_changes - before} translations from {translated_file}")
 
-    # Collect unique articles that need translation
-    to_translate = {}
-    for pg in data["pages"]:
+
+def _remember(conn: sqlite3.Connection, sid, key: bytes, translation: dict):
+    conn.execute(
+        "INSERT OR REPLACE INTO tr(sid, content_hash, headline_en, body_en) VALUES (?, ?, ?, ?)",
+        (str(sid), key, translation["headline_en"], translation["body_en"]),
+    )
+    conn.commit()
+
+
+class _TranslationPlan:
+    """Decides, page by page, which articles still need the API.
+
+    Articles found in the translation memory -- by storyid, or by identical
+    Hindi text under another storyid -- get that translation applied; a
+    storyid whose text matches an article already queued becomes an alias
+    of it.  A storyid hit only counts while its Hindi text is unchanged, and
+    only real translations are ever stored in the memory.
+    """
+
+    def __init__(self):
+        self.existing = {}       # sid -> translation from the memory
+        self.to_translate = {}   # sid -> art, in queue order
+        self.content_keys = {}   # sid -> content key, for articles sent to the API
+        self.queued_keys = set()
+        self.aliases = {}        # sid -> content key of an identical queued article
+        self.hash2result = {}    # content key -> translation known this run
+        self.from_memory = 0
+
+    def add_page(self, conn: sqlite3.Connection, pg: dict) -> list:
+        """Apply memory hits to pg's articles; return the newly queued
+        (queue_position, sid, art) entries."""
+        # One batched memory lookup per page
+        new = {}
+        for art in pg["articles"]:
+            sid = art["storyid"]
+            if art.get("headline_hi") and sid not in self.existing \
+                    and sid not in self.to_translate and sid not in self.aliases:
+                new[sid] = _content_key(art["headline_hi"], art.get("body_hi", ""))
+        by_sid, by_key = _lookup_memory(
+            conn, [str(sid) for sid in new],
+            list({key for key in new.values() if key not in self.hash2result}))
+        by_key.update(self.hash2result)
+
+        queued = []
         for art in pg["articles"]:
             sid = art["storyid"]
-            if sid in existing_translations:
+            if sid in new:
+                key = new.pop(sid)
+                stored_key, stored = by_sid.get(str(sid), (None, None))
+                if stored is not None and stored_key in (key, None):
+                    self.existing[sid] = stored
+                    self.hash2result[key] = stored
+                elif key in by_key:
+                    # Same text translated before (possibly under another storyid)
+                    self.existing[sid] = by_key[key]
+                    self.hash2result[key] = by_key[key]
+                    _remember(conn, sid, key, by_key[key])
+                    self.from_memory += 1
+                elif key in self.queued_keys:
+                    self.aliases[sid] = key  # identical article already queued
+                else:
+                    self.content_keys[sid] = key
+                    self.queued_keys.add(key)
+                    self.to_translate[sid] = art
+                    queued.append((len(self.to_translate), sid, art))
+            if sid in self.existing:
                 # Already translated — apply cached translation
-                art["headline_en"] = existing_translations[sid]["headline_en"]
-                art["body_en"] = existing_translations[sid]["body_en"]
-            elif sid not in to_translate and art.get("headline_hi"):
-                to_translate[sid] = art
+                art["headline_en"] = self.existing[sid]["headline_en"]
+                art["body_en"] = self.existing[sid]["body_en"]
+        return queued
 
-    print(f"  Articles to translate: {len(to_translate)}")
+    def report(self):
+        if self.existing:
+            print(f"  Found {len(self.existing)} already-translated articles "
+                  f"(cache; {self.from_memory} matched by content)")
+        print(f"  Articles to translate: {len(self.to_translate)} ({len(self.aliases)} duplicates)")
+
+    def resolve_aliases(self, conn: sqlite3.Connection, translated_by_key: dict) -> dict:
+        """Duplicates share the translation of the copy that was sent."""
+        resolved = {}
+        for sid, key in self.aliases.items():
+            if key in translated_by_key:
+                resolved[sid] = dict(translated_by_key[key])
+                _remember(conn, sid, key, resolved[sid])
+        return resolved
+
+
+def _write_translated(data: dict, translated_file: str, translated_cache: dict,
+                      existing_translations: dict):
+    """Apply the memory and translated_cache to data and write to disk.
+
+    Articles with no translation (new or from the memory) keep their Hindi
+    text in the English fields.
+    """
+    # One lookup per article: fresh translations override the memory's
+    merged = {**existing_translations, **translated_cache}
+    _m_get = merged.get
+    for pg in data["pages"]:
+        for art in pg["articles"]:
+            tr = _m_get(art["storyid"])
+            if tr:
+                art["headline_en"] = tr["headline_en"]
+                art["body_en"] = tr["body_en"]
+            else:
+                art["headline_en"] = art.get("headline_hi", "")
+                art["body_en"] = art.get("body_hi", "")
+    option = orjson.OPT_NON_STR_KEYS
+    if TRANSLATE_PRETTY:
+        option |= orjson.OPT_INDENT_2
+    with open(translated_file, "wb") as f:
+        f.write(orjson.dumps(data, option=option))
+
+
+def _print_summary(data: dict, translated_file: str, translated_cache: dict,
+                   existing_translations: dict):
+    total = sum(len(pg["articles"]) for pg in data["pages"])
+    translated_count = sum(
+        1 for pg in data["pages"]
+        for a in pg["articles"]
+        if a.get("headline_en") and a["headline_en"] != a.get("headline_hi")
+    )
+    print(f"\n  Done! Saved {translated_file}")
+    print(f"  Total article zones: {total}")
+    print(f"  Newly translated: {len(translated_cache)}")
+    print(f"  From cache: {len(existing_translations)}")
+    print(f"  Total translated: {translated_count}/{total}")
+
+
+async def _translate_realtime(date_str: str, client: AsyncOpenAI, conn: sqlite3.Connection):
+    raw_file, translated_file, _ = _paths(date_str)
+
+    pages_list = []
+    data = {"date": date_str, "pages": pages_list}
+
+    plan = _TranslationPlan()
+    to_translate = plan.to_translate
+    translated_by_key = {}
 
     def _save_progress():
-        """Apply translated_cache to data and write to disk."""
-        for pg in data["pages"]:
-            for art in pg["articles"]:
-                sid = art["storyid"]
-                if sid in translated_cache:
-                    art["headline_en"] = translated_cache[sid]["headline_en"]
-                    art["body_en"] = translated_cache[sid]["body_en"]
-                elif sid not in existing_translations:
-                    art["headline_en"] = art.get("headline_hi", "")
-                    art["body_en"] = art.get("body_hi", "")
-        with open(translated_file, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
-
-    # Translate each unique article
+        _write_translated(data, translated_file, translated_cache, plan.existing)
+
     translated_cache = {}
-    daily_limit_hit = False
-    for i, (sid, art) in enumerate(to_translate.items(), 1):
+    successes = 0
+    controller = AIMDConcurrency()
+    rpm_bucket = TokenBucket(RATE_LIMIT_RPM, RATE_LIMIT_RPM / 60)
+    tpm_bucket = TokenBucket(RATE_LIMIT_TPM, RATE_LIMIT_TPM / 60)
+
+    def _record(sid, headline_en, body_en):
+        """Store a successful translation and commit it to the memory."""
+        nonlocal successes
+        translated_cache[sid] = {
+            "headline_en": headline_en,
+            "body_en": body_en,
+        }
+        key = plan.content_keys[sid]
+        translated_by_key[key] = translated_cache[sid]
+        print(f"      ✓ storyid={sid} English: {headline_en[:60]}...")
+
+        _remember(conn, sid, key, translated_cache[sid])
+        successes += 1
+        if successes % SAVE_EVERY == 0:
+            _save_progress()
+
+    async def _translate_long(i, sid, art):
+        """Translate a long article as one headline request plus concurrent
+        body-chunk requests, instead of truncating the body."""
+        headline_hi = art.get("headline_hi", "")
+        body_hi = art.get("body_hi", "")
+        chunks = _split_body(body_hi)
+        fanout = asyncio.Semaphore(LONG_ARTICLE_FANOUT)
+        print(f"    [{i}/{len(to_translate)}] Translating storyid={sid} (long body: {len(chunks)} chunks)...")
+
+        async def _part(prompt, key, is_complete):
+            async with fanout, controller:
+                reply = await _call_api(client, prompt, rpm_bucket, tpm_bucket,
+                                        controller, is_complete)
+            result = _extract_json(reply)
+            return result.get(key) if isinstance(result, dict) else None
+
+        try:
+            parts = await asyncio.gather(
+                _part("".join((_HP_PREFIX, headline_hi, _HP_SUFFIX)),
+                      "headline_en", _headline_reply_complete),
+                *(_part("".join((_CP_PREFIX, chunk, _CP_SUFFIX)),
+                        "body_en", _body_reply_complete) for chunk in chunks),
+            )
+        except Exception as e:
+            print(f"      ✗ storyid={sid}: API error: {e}. Keeping Hindi text.")
+            parts = None
+
+        if parts is None or not all(parts):
+            if parts is not None:
+                print(f"      ⚠ storyid={sid}: could not parse every chunk. Keeping Hindi text.")
+            translated_cache[sid] = {
+                "headline_en": headline_hi,
+                "body_en": body_hi,
+            }
+            return
+        _record(sid, parts[0], "\n\n".join(parts[1:]))
+
+    async def _translate_one(i, sid, art):
+        """Translate one article into translated_cache (bounded by controller)."""
         headline_hi = art.get("headline_hi", "")
         body_hi = art.get("body_hi", "")
 
         if not headline_hi and not body_hi:
             print(f"    [{i}/{len(to_translate)}] storyid={sid} — no Hindi text, skipping")
-            continue
+            return
 
-        # Truncate very long bodies to avoid token limit issues
-        body_for_api = body_hi or "(no body text)"
-        if len(body_for_api) > MAX_BODY_CHARS:
-            body_for_api = body_for_api[:MAX_BODY_CHARS] + "..."
-            print(f"    [{i}/{len(to_translate)}] Translating storyid={sid} (body truncated to {MAX_BODY_CHARS} chars)...")
-        else:
+        if _is_long_body(body_hi):
+            await _translate_long(i, sid, art)
+            return
+
+        async with controller:
+            body_for_api, _ = _body_for_api(body_hi)
             print(f"    [{i}/{len(to_translate)}] Translating storyid={sid}...")
-        print(f"      Hindi headline: {headline_hi[:60]}...")
+            print(f"      Hindi headline: {headline_hi[:60]}...")
 
-        try:
-            prompt = TRANSLATION_PROMPT.format(
-                hindi_headline=headline_hi,
-                hindi_body=body_for_api,
-            )
+            try:
+                prompt = "".join((_P_PREFIX, headline_hi, _P_MID, body_for_api, _P_SUFFIX))
 
-            reply = _call_api_with_retry(client, prompt)
+                reply = await _call_api(client, prompt, rpm_bucket, tpm_bucket,
+                                        controller, _single_reply_complete)
 
-            # Robust JSON extraction from model output
-            result = _extract_json(reply)
-            if result is None:
-                print(f"      ⚠ Could not parse JSON from API response. Keeping Hindi text.")
-                print(f"        Raw reply (first 200 chars): {reply[:200]}")
+                # Robust JSON extraction from model output
+                result = _extract_json(reply)
+                if result is None:
+                    print(f"      ⚠ storyid={sid}: could not parse JSON from API response. Keeping Hindi text.")
+                    print(f"        Raw reply (first 200 chars): {reply[:200]}")
+                    translated_cache[sid] = {
+                        "headline_en": headline_hi,
+                        "body_en": body_hi,
+                    }
+                elif not result.get("headline_en"):
+                    # Not a real translation -- keep the Hindi, and keep it out
+                    # of the memory so the next run tries again
+                    print(f"      ⚠ storyid={sid}: reply had no headline_en. Keeping Hindi text.")
+                    translated_cache[sid] = {
+                        "headline_en": headline_hi,
+                        "body_en": body_hi,
+                    }
+                else:
+                    _record(sid, result["headline_en"], result.get("body_en", ""))
+
+            except Exception as e:
+                print(f"      ✗ storyid={sid}: API error: {e}. Keeping Hindi text.")
                 translated_cache[sid] = {
                     "headline_en": headline_hi,
                     "body_en": body_hi,
                 }
-            else:
-                headline_en = result.get("headline_en", "")
-                body_en = result.get("body_en", "")
 
-                translated_cache[sid] = {
-                    "headline_en": headline_en,
-                    "body_en": body_en,
-                }
-                print(f"      ✓ English: {headline_en[:60]}...")
+    async def _translate_one_batch(batch):
+        """Translate up to BATCH_SIZE (i, sid, art) entries in one request.
 
-            _save_progress()  # save after every article
+        Articles the reply doesn't cover are retried one request each.
+        """
+        if len(batch) == 1:
+            await _translate_one(*batch[0])
+            return
 
-        except DailyLimitExhausted as e:
-            print(f"\n  ⚠ Daily token limit exhausted! Saving partial progress.")
-            print(f"    Error detail: {str(e)[:300]}")
-            print(f"    Re-run later to translate remaining articles.")
-            translated_cache[sid] = {
-                "headline_en": headline_hi,
-                "body_en": body_hi,
+        items = [
+            {
+                "id": str(sid),
+                "headline_hi": art.get("headline_hi", ""),
+                "body_hi": _body_for_api(art.get("body_hi", ""))[0],
             }
-            daily_limit_hit = True
-            break
+            for _, sid, art in batch
+        ]
+        results = None
+        async with controller:
+            first, last = batch[0][0], batch[-1][0]
+            print(f"    [{first}-{last}/{len(to_translate)}] Translating {len(batch)} articles in one request...")
+            try:
+                prompt = "".join((_BP_PREFIX, orjson.dumps(items).decode(), _BP_SUFFIX))
+                reply = await _call_api(client, prompt, rpm_bucket, tpm_bucket,
+                                        controller, _batch_reply_complete)
+                results = _extract_json_array(reply)
+                if results is None:
+                    print(f"      ⚠ could not parse JSON list from batched reply; retrying singly.")
+            except Exception as e:
+                print(f"      ✗ batched request failed: {e}. Retrying singly.")
 
-        except Exception as e:
-            print(f"      ✗ API error: {e}. Keeping Hindi text.")
-            translated_cache[sid] = {
-                "headline_en": headline_hi,
-                "body_en": body_hi,
-            }
+        by_id = {str(sid): sid for _, sid, _ in batch}
+        done = set()
+        for item in results or []:
+            if not isinstance(item, dict) or str(item.get("id")) not in by_id:
+                continue
+            headline_en = item.get("headline_en", "")
+            if not headline_en:
+                continue
+            sid = by_id[str(item["id"])]
+            _record(sid, headline_en, item.get("body_en", ""))
+            done.add(sid)
 
-        time.sleep(1)  # Rate limiting
+        missing = [entry for entry in batch if entry[1] not in done]
+        if missing and results is not None:
+            print(f"      ⚠ batched reply missed {len(missing)} articles; retrying singly.")
+        await asyncio.gather(*(_translate_one(*entry) for entry in missing))
+
+    # Stream pages in, collecting unique articles that need translation, and
+    # dispatch each full batch of BATCH_SIZE as soon as it fills.
+    tasks = []
+    pending = []
+    for pg in _iter_pages(raw_file):
+        pages_list.append(pg)
+        for entry in plan.add_page(conn, pg):
+            if _is_long_body(entry[2].get("body_hi", "")):
+                # Long bodies are split into their own requests
+                tasks.append(asyncio.create_task(_translate_one(*entry)))
+                continue
+            pending.append(entry)
+            if len(pending) == BATCH_SIZE:
+                tasks.append(asyncio.create_task(_translate_one_batch(pending)))
+                pending = []
+        await asyncio.sleep(0)  # let dispatched batches start
+    if pending:
+        tasks.append(asyncio.create_task(_translate_one_batch(pending)))
+
+    plan.report()
+    await asyncio.gather(*tasks)
+    translated_cache.update(plan.resolve_aliases(conn, translated_by_key))
 
     # Final save
     _save_progress()
 
-    total = sum(len(pg["articles"]) for pg in data["pages"])
-    translated_count = sum(
-        1 for pg in data["pages"]
-        for a in pg["articles"]
-        if a.get("headline_en") and a["headline_en"] != a.get("headline_hi")
-    )
-    print(f"\n  Done! Saved {translated_file}")
-    print(f"  Total article zones: {total}")
-    print(f"  Newly translated: {len(translated_cache)}")
-    print(f"  From cache: {len(existing_translations)}")
-    print(f"  Total translated: {translated_count}/{total}")
-    if daily_limit_hit:
-        remaining = len(to_translate) - i
-        print(f"  ⚠ {remaining} articles still need translation (daily limit hit)")
-        print(f"    Re-run this script later when the quota resets.")
+    _print_summary(data, translated_file, translated_cache, plan.existing)
+    missing = len(to_translate) - successes
+    if missing:
+        print(f"  ⚠ {missing} articles still need translation; re-run to retry them.")
+
+
+async def _translate_batch_job(date_str: str, client: AsyncOpenAI, conn: sqlite3.Connection):
+    """Translate every uncached article in one Batch API job."""
+    raw_file, translated_file, _ = _paths(date_str)
+    batch_file = os.path.join(os.path.dirname(raw_file), "batch_input.jsonl")
+
+    pages_list = []
+    data = {"date": date_str, "pages": pages_list}
+    plan = _TranslationPlan()
+
+    # One chat-completions request per article, keyed by storyid
+    with open(batch_file, "wb") as f:
+        for pg in _iter_pages(raw_file):
+            pages_list.append(pg)
+            for _, sid, art in plan.add_page(conn, pg):
+                body_for_api, _ = _body_for_api(art.get("body_hi", ""))
+                prompt = "".join((_P_PREFIX, art["headline_hi"], _P_MID, body_for_api, _P_SUFFIX))
+                f.write(orjson.dumps({
+                    "custom_id": str(sid),
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": {
+                        "model": MODEL,
+                        "messages": [{"role": "user", "content": prompt}],
+                        "temperature": 0.3,
+                        "max_tokens": 4096,
+                    },
+                }) + b"\n")
+    plan.report()
+
+    translated_cache = {}
+    translated_by_key = {}
+    if plan.to_translate:
+        with open(batch_file, "rb") as f:
+            batch_input = await client.files.create(file=f, purpose="batch")
+        batch = await client.batches.create(
+            input_file_id=batch_input.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+        print(f"  Submitted batch {batch.id}; polling every {BATCH_POLL_SECONDS}s...")
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            await asyncio.sleep(BATCH_POLL_SECONDS)
+            batch = await client.batches.retrieve(batch.id)
+            print(f"    batch {batch.id}: {batch.status}")
+
+        if batch.status == "completed" and batch.output_file_id:
+            output = await client.files.content(batch.output_file_id)
+            by_id = {str(sid): sid for sid in plan.to_translate}
+            for line in output.content.splitlines():
+                if not line.strip():
+                    continue
+                rec = orjson.loads(line)
+                sid = by_id.get(rec.get("custom_id"))
+                response = rec.get("response") or {}
+                if sid is None or response.get("status_code") != 200:
+                    continue
+                reply = response["body"]["choices"][0]["message"]["content"] or ""
+                result = _extract_json(reply)
+                if not isinstance(result, dict) or not result.get("headline_en"):
+                    print(f"      ⚠ storyid={sid}: could not parse JSON from batch result. Keeping Hindi text.")
+                    continue
+                translated_cache[sid] = {
+                    "headline_en": result["headline_en"],
+                    "body_en": result.get("body_en", ""),
+                }
+                key = plan.content_keys[sid]
+                translated_by_key[key] = translated_cache[sid]
+                _remember(conn, sid, key, translated_cache[sid])
+        else:
+            print(f"  ⚠ Batch {batch.id} ended with status {batch.status!r}. Keeping Hindi text.")
+
+    translated_cache.update(plan.resolve_aliases(conn, translated_by_key))
+    _write_translated(data, translated_file, translated_cache, plan.existing)
+    _print_summary(data, translated_file, translated_cache, plan.existing)
+    missing = len(plan.to_translate) - sum(1 for sid in plan.to_translate if sid in translated_cache)
+    if missing:
+        print(f"  ⚠ {missing} articles still need translation; re-run to retry them.")
 
 
 if __name__ == "__main__":
     import sys
-    date = sys.argv[1] if len(sys.argv) > 1 else "2026-02-25"
-    translate_articles(date)
+    args = [a for a in sys.argv[1:] if a != "--batch"]
+    date = args[0] if args else "2026-02-25"
+    if "--batch" in sys.argv[1:]:
+        translate_articles_batch(date)
+    else:
+        translate_articles(date)
@@ -11,15 +11,42 @@ Output JSON is grouped per page -> articles (by storyid) + unassigned blocks.
 from __future__ import annotations
 
 import argparse
-import json
+import atexit
 import os
 import re
-import time
+import sys
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
+from itertools import repeat
+from operator import attrgetter
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
-from bs4 import BeautifulSoup
+import orjson
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    # C DOM with compiled CSS selectors; much faster than a bs4 tree walk
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:  # optional
+    LexborHTMLParser = None
+
+try:
+    import numpy as np
+except ImportError:  # optional -- zone assignment falls back to pure Python
+    np = None
+
+try:
+    from numba import njit
+except ImportError:  # optional -- NumPy broadcast is used instead
+    njit = None
+
+try:
+    import shapely
+    from shapely.strtree import STRtree
+except ImportError:  # optional -- only used for very dense pages
+    STRtree = None
 
 try:
     import fitz  # PyMuPDF
@@ -27,6 +54,7 @@ except Exception as exc:  # pragma: no cover
     raise RuntimeError("PyMuPDF is required. Install with: pip install PyMuPDF") from exc
 
 try:
+    from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
     from playwright.sync_api import sync_playwright
 except Exception as exc:  # pragma: no cover
     raise RuntimeError("Playwright is required. Install with: pip install playwright") from exc
@@ -39,6 +67,26 @@ OUTPUT_DIR = "output"
 COORD_SPACE_W = 1128
 COORD_SPACE_H = 2050
 
+# Above this many block x zone pairs, an STRtree join beats the dense
+# NumPy broadcast in _assign_storyids (measured crossover ~50k).
+STRTREE_MIN_PAIRS = 50_000
+
+# Cells per side of the zone lookup grid used when NumPy isn't available
+ZONE_GRID = 10
+
+# Page background JPEG quality (PyMuPDF defaults to 95; 85 is about half
+# the bytes with no visible difference behind the overlays).
+JPG_QUALITY = 85
+
+# get_text("blocks") flags: only what block text needs -- no ligature
+# preservation, no image blocks.  Unknown-unicode glyphs still map to their
+# CIDs, and text outside the mediabox is still clipped, as by default.
+TEXT_FLAGS = (
+    fitz.TEXT_PRESERVE_WHITESPACE
+    | fitz.TEXT_MEDIABOX_CLIP
+    | getattr(fitz, "TEXT_CID_FOR_UNKNOWN_UNICODE", 0)
+)
+
 
 def _default_date() -> str:
     return datetime.now().strftime("%Y-%m-%d")
@@ -51,106 +99,281 @@ def _mk_dirs(path: str) -> None:
 def _pct(value: float, total: float) -> float:
     if total <= 0:
         return 0.0
-    return round((value / total) * 100.0, 3)
+    return (value / total) * 100.0
+
+
+# The lookbehind keeps e.g. "margin-top" from being read as "top"
+_STYLE_RE = re.compile(r"(?<![-\w])(top|left|width|height)\s*:\s*([\d.]+)px")
 
 
 def _parse_style(style_str: str) -> dict[str, float]:
     """Extract top, left, width, height from inline style string."""
     props: dict[str, float] = {}
-    for prop in ("top", "left", "width", "height"):
-        match = re.search(rf"{prop}:\s*([\d.]+)px", style_str)
-        if match:
-            props[prop] = float(match.group(1))
+    for prop, value in _STYLE_RE.findall(style_str):
+        props.setdefault(prop, float(value))
     return props
 
 
-def _extract_pagerectangles(html: str) -> dict[int, list[dict[str, Any]]]:
-    """Parse #ImageContainer slides and extract article pagerectangles only."""
-    soup = BeautifulSoup(html, "lxml")
-    container = soup.find(id="ImageContainer")
-    if not container:
+def _zone_from_attrs(storyid: str | None, style: str | None) -> dict[str, Any] | None:
+    """Build a zone from a pagerectangle's storyid/style attributes."""
+    # Interned: the same few dozen storyids repeat across a page's zones
+    storyid = sys.intern((storyid or "").strip())
+    coords = _parse_style(style or "")
+
+    if not storyid:
+        return None
+    if not all(k in coords for k in ("top", "left", "width", "height")):
+        return None
+
+    return {
+        "storyid": storyid,
+        "top": coords["top"],
+        "left": coords["left"],
+        "width": coords["width"],
+        "height": coords["height"],
+    }
+
+
+# page.content() is Chromium's serialization, so attributes are always
+# double-quoted and every <div>/<li> is closed; that makes a plain regex scan
+# reliable for this markup.  Class and id names are matched as whole tokens
+# ("pagerectangle", not "pagerectangle-hover" or "data-id").
+_CONTAINER_RE = re.compile(r'<(\w+)\b[^>]*?(?<![-\w])id="ImageContainer"')
+_SLIDE_RE = re.compile(r'<li\b[^>]*?(?<![-\w])class="[^"]*(?<![-\w])mySlides(?![-\w])')
+_RECT_RE = re.compile(r'<div\b[^>]*?(?<![-\w])class="[^"]*(?<![-\w])pagerectangle(?![-\w])[^>]*>')
+_ATTR_RE = re.compile(r'(?<![-\w])(storyid|style)="([^"]*)"')
+
+
+def _element_end(html: str, tag: str, start: int) -> int:
+    """Index just past the close of the <tag> element opened at `start`,
+    or -1 if its open/close tags don't balance."""
+    depth = 0
+    for m in re.compile(rf"<(/?){tag}\b").finditer(html, start):
+        depth += -1 if m.group(1) else 1
+        if depth == 0:
+            return html.find(">", m.end()) + 1
+    return -1
+
+
+def _extract_pagerectangles_regex(html: str) -> dict[int, list[dict[str, Any]]]:
+    """Regex equivalent of the DOM parse: li.mySlides inside #ImageContainer,
+    each with the div.pagerectangle elements inside it.
+
+    Returns {} (so the caller falls back to a DOM parser) when the container
+    is missing, holds no slides, or its tags don't balance.
+    """
+    container = _CONTAINER_RE.search(html)
+    if container is None:
+        return {}
+    container_end = _element_end(html, container.group(1), container.start())
+    if container_end < 0:
+        return {}
+
+    page_zones: dict[int, list[dict[str, Any]]] = {}
+    pos = container.end()
+    while (slide := _SLIDE_RE.search(html, pos, container_end)) is not None:
+        slide_end = _element_end(html, "li", slide.start())
+        if not 0 <= slide_end <= container_end:
+            return {}
+        zones: list[dict[str, Any]] = []
+        for rect in _RECT_RE.finditer(html, slide.end(), slide_end):
+            attrs = dict(_ATTR_RE.findall(rect.group(0)))
+            zone = _zone_from_attrs(attrs.get("storyid"), attrs.get("style"))
+            if zone:
+                zones.append(zone)
+        page_zones[len(page_zones) + 1] = zones
+        pos = slide_end
+    return page_zones
+
+
+def _extract_pagerectangles_lexbor(html: str) -> dict[int, list[dict[str, Any]]]:
+    tree = LexborHTMLParser(html)
+    container = tree.css_first("#ImageContainer")
+    if container is None:
         raise RuntimeError("Could not find #ImageContainer in epaper HTML")
 
-    slides = container.find_all("li", class_="mySlides")
+    page_zones: dict[int, list[dict[str, Any]]] = {}
+    for page_idx, slide in enumerate(container.css("li.mySlides"), start=1):
+        zones: list[dict[str, Any]] = []
+        for rect in slide.css("div.pagerectangle"):
+            attrs = rect.attributes
+            zone = _zone_from_attrs(attrs.get("storyid"), attrs.get("style"))
+            if zone:
+                zones.append(zone)
+        page_zones[page_idx] = zones
+
+    return page_zones
+
+
+# A regex rather than a class list: strainers compare the whole class
+# attribute, and slides carry extra classes ("mySlides fade").
+_SLIDE_STRAINER = SoupStrainer(["li", "div"], class_=re.compile(r"\b(?:mySlides|pagerectangle)\b"))
+
+
+def _extract_pagerectangles(html: str) -> dict[int, list[dict[str, Any]]]:
+    """Parse #ImageContainer slides and extract article pagerectangles only.
+
+    The markup is machine-generated, so a regex scan is tried first; a DOM
+    parser is only used if it finds no slides.
+    """
+    page_zones = _extract_pagerectangles_regex(html)
+    if page_zones:
+        return page_zones
+
+    if LexborHTMLParser is not None:
+        return _extract_pagerectangles_lexbor(html)
+
+    # Only build nodes for slides and rectangles; scripts, styles and nav
+    # are skipped by lxml instead of being parsed and thrown away.
+    soup = BeautifulSoup(html, "lxml", parse_only=_SLIDE_STRAINER)
+    slides = soup.find_all("li", class_="mySlides")
+    if not slides:
+        raise RuntimeError("Could not find #ImageContainer slides in epaper HTML")
+
     page_zones: dict[int, list[dict[str, Any]]] = {}
 
     for page_idx, slide in enumerate(slides, start=1):
         zones: list[dict[str, Any]] = []
         rectangles = slide.find_all("div", class_="pagerectangle")
         for rect in rectangles:
-            storyid = (rect.get("storyid") or "").strip()
-            style = rect.get("style", "")
-            coords = _parse_style(style)
-
-            if not storyid:
-                continue
-            if not all(k in coords for k in ("top", "left", "width", "height")):
-                continue
-
-            zones.append(
-                {
-                    "storyid": storyid,
-                    "top": coords["top"],
-                    "left": coords["left"],
-                    "width": coords["width"],
-                    "height": coords["height"],
-                }
-            )
+            zone = _zone_from_attrs(rect.get("storyid"), rect.get("style", ""))
+            if zone:
+                zones.append(zone)
 
         page_zones[page_idx] = zones
 
     return page_zones
 
 
+# One Chromium per process, launched on first scrape and reused after that
+_pw = None
+_browser = None
+
+# Only the DOM is needed; skip downloading images and fonts
+_BLOCKED_ASSETS = "**/*.{png,jpg,jpeg,gif,svg,webp,woff,woff2}"
+
+
+def _get_browser(headless: bool = True) -> Any:
+    """Launch Chromium on first use (later calls reuse it, whatever headless)."""
+    global _pw, _browser
+    if _browser is None:
+        _pw = sync_playwright().start()
+        _browser = _pw.chromium.launch(headless=headless)
+        atexit.register(close_browser)
+    return _browser
+
+
+def close_browser() -> None:
+    """Shut down the shared browser, if one was started."""
+    global _pw, _browser
+    if _browser is not None:
+        _browser.close()
+        _browser = None
+    if _pw is not None:
+        _pw.stop()
+        _pw = None
+
+
 def scrape_pagerectangles(
     epaper_url: str = "https://epaper.aajtak.in/",
     max_carousel_clicks: int = 12,
     click_wait_sec: float = 1.5,
     headless: bool = True,
 ) -> dict[int, list[dict[str, Any]]]:
-    """Use Playwright to load epaper and extract page-level pagerectangles."""
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=headless)
-        context = browser.new_context(
-            user_agent=(
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/124.0.0.0 Safari/537.36"
-            ),
-            viewport={"width": 1400, "height": 900},
-        )
+    """Use Playwright to load epaper and extract page-level pagerectangles.
+
+    Each carousel click waits for new rectangles to appear rather than
+    sleeping a fixed time, but never longer than click_wait_sec -- the old
+    fixed sleep -- so slides that add none (ads, or every click once the
+    carousel wraps) cost no more than before.  Clicking stops only when the
+    next button is gone or can't be clicked.
+    """
+    context = _get_browser(headless=headless).new_context(
+        user_agent=(
+            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+            "AppleWebKit/537.36 (KHTML, like Gecko) "
+            "Chrome/124.0.0.0 Safari/537.36"
+        ),
+        viewport={"width": 1400, "height": 900},
+    )
+    context.route(_BLOCKED_ASSETS, lambda route: route.abort())
+    try:
         page = context.new_page()
         page.goto(epaper_url, timeout=60000)
         page.wait_for_selector("#ImageContainer", timeout=30000)
-        time.sleep(2)
+        try:
+            page.wait_for_selector("div.pagerectangle", state="attached", timeout=5000)
+        except PlaywrightTimeoutError:
+            pass  # may only appear once the carousel moves
 
         # Click carousel to trigger lazy-loaded rectangles.
         for _ in range(max(0, max_carousel_clicks)):
             next_btn = page.query_selector("button.next")
             if not next_btn:
                 break
+            prev_count = page.eval_on_selector_all("div.pagerectangle", "els => els.length")
             try:
                 next_btn.click(timeout=5000)
-                time.sleep(click_wait_sec)
             except Exception:
                 break
+            try:
+                page.wait_for_function(
+                    "n => document.querySelectorAll('div.pagerectangle').length > n",
+                    arg=prev_count,
+                    timeout=click_wait_sec * 1000,
+                )
+            except PlaywrightTimeoutError:
+                pass  # nothing new on this slide; later ones may still load
 
-        time.sleep(1)
         html = page.content()
-        browser.close()
+    finally:
+        context.close()
 
     return _extract_pagerectangles(html)
 
 
+@dataclass(slots=True)
+class Block:
+    """A serialized PDF text block.
+
+    orjson writes the fields in this order; underscore fields are working
+    data for zone assignment and are left out of the JSON.
+    """
+
+    block_id: str
+    block_no: int | None
+    block_type: int | None
+    text: str
+    x0: float
+    y0: float
+    x1: float
+    y1: float
+    cx: float
+    cy: float
+    width: float
+    height: float
+    top_pct: float
+    left_pct: float
+    width_pct: float
+    height_pct: float
+    _xyxy: tuple[float, float, float, float]
+    col_bin: int = 0
+
+
 def _serialize_block(
     block: tuple[Any, ...],
     block_id: str,
-    page_w: float,
-    page_h: float,
-) -> dict[str, Any] | None:
+    inv_w: float,
+    inv_h: float,
+) -> Block | None:
     """
     PyMuPDF block tuple from get_text("blocks") is typically:
       (x0, y0, x1, y1, text, block_no, block_type)
+
+    Only text blocks (block_type 0) are kept; image blocks are dropped.
+
+    inv_w / inv_h are the page's 100/width and 100/height (see _inv_pct),
+    so percentages are one multiply per value.
     """
     if len(block) < 5:
         return None
@@ -159,6 +382,8 @@ def _serialize_block(
     block_no = block[5] if len(block) > 5 else None
     block_type = block[6] if len(block) > 6 else None
 
+    if block_type not in (0, None):
+        return None
     if not isinstance(text, str):
         return None
 
@@ -170,25 +395,108 @@ def _serialize_block(
     height = max(0.0, float(y1) - float(y0))
     cx = (float(x0) + float(x1)) / 2.0
     cy = (float(y0) + float(y1)) / 2.0
+    bx0, by0, bx1, by1 = float(x0), float(y0), float(x1), float(y1)
+
+    return Block(
+        block_id=block_id,
+        block_no=int(block_no) if isinstance(block_no, (int, float)) else block_no,
+        block_type=int(block_type) if isinstance(block_type, (int, float)) else block_type,
+        text=cleaned,
+        x0=bx0,
+        y0=by0,
+        x1=bx1,
+        y1=by1,
+        cx=cx,
+        cy=cy,
+        width=width,
+        height=height,
+        top_pct=by0 * inv_h,
+        left_pct=bx0 * inv_w,
+        width_pct=width * inv_w,
+        height_pct=height * inv_h,
+        _xyxy=(bx0, by0, bx1, by1),
+    )
 
-    return {
-        "block_id": block_id,
-        "block_no": int(block_no) if isinstance(block_no, (int, float)) else block_no,
-        "block_type": int(block_type) if isinstance(block_type, (int, float)) else block_type,
-        "text": cleaned,
-        "x0": round(float(x0), 3),
-        "y0": round(float(y0), 3),
-        "x1": round(float(x1), 3),
-        "y1": round(float(y1), 3),
-        "cx": round(cx, 3),
-        "cy": round(cy, 3),
-        "width": round(width, 3),
-        "height": round(height, 3),
-        "top_pct": _pct(float(y0), page_h),
-        "left_pct": _pct(float(x0), page_w),
-        "width_pct": _pct(width, page_w),
-        "height_pct": _pct(height, page_h),
-    }
+
+def _inv_pct(total: float) -> float:
+    """Multiplier turning a coordinate into a percentage of total (0 if empty)."""
+    return 100.0 / total if total > 0 else 0.0
+
+
+def _serialize_blocks(
+    raw_blocks: list[tuple[Any, ...]],
+    page_num: int,
+    page_w: float,
+    page_h: float,
+) -> list[Block]:
+    """_serialize_block for every block on a page.
+
+    The coordinate arithmetic runs as NumPy column operations;
+    only the final Block construction is per block.  Each block also gets
+    its col_bin here, so _sort_article_blocks doesn't need another pass.
+    """
+    inv_w = _inv_pct(page_w)
+    inv_h = _inv_pct(page_h)
+    col_width = _est_col_width(page_w)
+
+    if np is None:
+        serialized = (
+            _serialize_block(block, f"p{page_num}_b{b_idx}", inv_w, inv_h)
+            for b_idx, block in enumerate(raw_blocks, start=1)
+        )
+        blocks = [parsed for parsed in serialized if parsed]
+        for parsed in blocks:
+            parsed.col_bin = int(parsed.x0 / col_width)
+        return blocks
+
+    kept = [
+        (b_idx, block)
+        for b_idx, block in enumerate(raw_blocks, start=1)
+        if len(block) >= 5
+        and (len(block) < 7 or block[6] == 0)
+        and isinstance(block[4], str)
+        and block[4].strip()
+    ]
+    if not kept:
+        return []
+
+    coords = np.array([block[:4] for _, block in kept], dtype=np.float64)
+    x0, y0, x1, y1 = coords.T
+    width = np.maximum(0.0, x1 - x0)
+    height = np.maximum(0.0, y1 - y0)
+    cx = (x0 + x1) / 2.0
+    cy = (y0 + y1) / 2.0
+
+    columns = zip(
+        *(
+            col.tolist()
+            for col in (
+                x0, y0, x1, y1, cx, cy, width, height,
+                y0 * inv_h, x0 * inv_w, width * inv_w, height * inv_h,
+                # astype truncates toward zero, like int()
+                (x0 / col_width).astype(np.int64),
+            )
+        )
+    )
+
+    serialized: list[Block] = []
+    for (b_idx, block), values in zip(kept, columns):
+        bx0, by0, bx1, by1, bcx, bcy, bw, bh, top, left, w_pct, h_pct, col_bin = values
+        block_no = block[5] if len(block) > 5 else None
+        block_type = block[6] if len(block) > 6 else None
+        serialized.append(
+            Block(
+                f"p{page_num}_b{b_idx}",
+                int(block_no) if isinstance(block_no, (int, float)) else block_no,
+                int(block_type) if isinstance(block_type, (int, float)) else block_type,
+                block[4].strip(),
+                bx0, by0, bx1, by1, bcx, bcy, bw, bh,
+                top, left, w_pct, h_pct,
+                (bx0, by0, bx1, by1),
+                col_bin,
+            )
+        )
+    return serialized
 
 
 def _box_inside_zone(box: dict[str, float], zone: dict[str, float], margin: float = 10.0) -> bool:
@@ -213,43 +521,55 @@ def _scaled_zone(zone: dict[str, Any], page_w: float, page_h: float) -> dict[str
     right = left + width
     bottom = top + height
 
+    scaled = {
+        "left": left,
+        "top": top,
+        "right": right,
+        "bottom": bottom,
+        "width": width,
+        "height": height,
+        "top_pct": _pct(top, page_h),
+        "left_pct": _pct(left, page_w),
+        "width_pct": _pct(width, page_w),
+        "height_pct": _pct(height, page_h),
+    }
+
     return {
         "storyid": zone["storyid"],
         "coord_space": {
-            "top": round(float(zone["top"]), 3),
-            "left": round(float(zone["left"]), 3),
-            "width": round(float(zone["width"]), 3),
-            "height": round(float(zone["height"]), 3),
-        },
-        "scaled": {
-            "left": round(left, 3),
-            "top": round(top, 3),
-            "right": round(right, 3),
-            "bottom": round(bottom, 3),
-            "width": round(width, 3),
-            "height": round(height, 3),
-            "top_pct": _pct(top, page_h),
-            "left_pct": _pct(left, page_w),
-            "width_pct": _pct(width, page_w),
-            "height_pct": _pct(height, page_h),
+            "top": float(zone["top"]),
+            "left": float(zone["left"]),
+            "width": float(zone["width"]),
+            "height": float(zone["height"]),
         },
+        "scaled": scaled,
     }
 
 
+# (left, top, right, bottom, storyid) of a scaled zone
+_ZoneBox = tuple[float, float, float, float, str]
+
+
+def _zone_box(zone: dict[str, Any]) -> _ZoneBox:
+    """Edges and storyid of a scaled zone, for zone assignment.
+
+    Built once per zone, so zone assignment unpacks a tuple per (block,
+    zone) pair instead of indexing dicts; kept out of the zone itself so it
+    never reaches the JSON.
+    """
+    scaled = zone["scaled"]
+    return scaled["left"], scaled["top"], scaled["right"], scaled["bottom"], str(zone["storyid"])
+
+
 def _assign_storyid(
-    block: dict[str, Any],
-    scaled_zones: list[dict[str, Any]],
+    block: Block,
+    zone_boxes: list[_ZoneBox],
     margin: float,
 ) -> str | None:
     """Assign block to zone with highest intersection percentage of block area."""
-    box = {
-        "left": float(block["x0"]),
-        "top": float(block["y0"]),
-        "right": float(block["x1"]),
-        "bottom": float(block["y1"]),
-    }
-    block_w = max(0.0, box["right"] - box["left"])
-    block_h = max(0.0, box["bottom"] - box["top"])
+    box_left, box_top, box_right, box_bottom = block._xyxy
+    block_w = max(0.0, box_right - box_left)
+    block_h = max(0.0, box_bottom - box_top)
     block_area = block_w * block_h
     if block_area <= 0:
         return None
@@ -257,22 +577,19 @@ def _assign_storyid(
     best_sid: str | None = None
     best_overlap_pct = 0.0
 
-    for zone in scaled_zones:
-        z = zone["scaled"]
-        zone_box = {
-            "left": float(z["left"]),
-            "top": float(z["top"]),
-            "right": float(z["right"]),
-            "bottom": float(z["bottom"]),
-        }
+    # Center-point containment as in _box_inside_zone, inlined: a call per
+    # (block, zone) pair costs more than the comparisons themselves.
+    cx = 0.5 * (box_left + box_right)
+    cy = 0.5 * (box_top + box_bottom)
 
-        if not _box_inside_zone(box, zone_box, margin=margin):
+    for zl, zt, zr, zb, sid in zone_boxes:
+        if not (zl - margin <= cx <= zr + margin and zt - margin <= cy <= zb + margin):
             continue
 
-        inter_left = max(box["left"], zone_box["left"])
-        inter_top = max(box["top"], zone_box["top"])
-        inter_right = min(box["right"], zone_box["right"])
-        inter_bottom = min(box["bottom"], zone_box["bottom"])
+        inter_left = max(box_left, zl)
+        inter_top = max(box_top, zt)
+        inter_right = min(box_right, zr)
+        inter_bottom = min(box_bottom, zb)
 
         inter_w = max(0.0, inter_right - inter_left)
         inter_h = max(0.0, inter_bottom - inter_top)
@@ -281,28 +598,193 @@ def _assign_storyid(
 
         if overlap_pct > best_overlap_pct:
             best_overlap_pct = overlap_pct
-            best_sid = str(zone["storyid"])
+            best_sid = sid
 
     return best_sid
 
 
-def _sort_article_blocks(blocks: list[dict[str, Any]], page_w: float) -> list[dict[str, Any]]:
+def _zone_grid(
+    zone_boxes: list[_ZoneBox],
+    page_w: float,
+    page_h: float,
+    margin: float,
+) -> Callable[[Block], list[_ZoneBox]]:
+    """Bucket zones into a ZONE_GRID x ZONE_GRID grid over the page.
+
+    Each zone is listed in every cell its margin-expanded box touches, so
+    the cell holding a block's centre already has every zone that could
+    contain it (in their original order).  Returns a block -> zones lookup.
+    """
+    cell_w = max(page_w, 1.0) / ZONE_GRID
+    cell_h = max(page_h, 1.0) / ZONE_GRID
+    last = ZONE_GRID - 1
+
+    def _col(x: float) -> int:
+        return min(last, max(0, int(x / cell_w)))
+
+    def _row(y: float) -> int:
+        return min(last, max(0, int(y / cell_h)))
+
+    cells: list[list[_ZoneBox]] = [[] for _ in range(ZONE_GRID * ZONE_GRID)]
+    for box in zone_boxes:
+        zl, zt, zr, zb, _ = box
+        for row in range(_row(zt - margin), _row(zb + margin) + 1):
+            for col in range(_col(zl - margin), _col(zr + margin) + 1):
+                cells[row * ZONE_GRID + col].append(box)
+
+    def zones_near(block: Block) -> list[_ZoneBox]:
+        x0, y0, x1, y1 = block._xyxy
+        col = int(0.5 * (x0 + x1) / cell_w)
+        row = int(0.5 * (y0 + y1) / cell_h)
+        if 0 <= col <= last and 0 <= row <= last:
+            return cells[row * ZONE_GRID + col]
+        return cells[_row(0.5 * (y0 + y1)) * ZONE_GRID + _col(0.5 * (x0 + x1))]
+
+    return zones_near
+
+
+def _assign_storyids(
+    blocks: list[Block],
+    scaled_zones: list[dict[str, Any]],
+    margin: float,
+    page_w: float,
+    page_h: float,
+) -> list[str | None]:
+    """_assign_storyid for all of a page's blocks at once.
+
+    With Numba installed, a compiled kernel does the whole page in one
+    pass.  Otherwise block/zone intersections are computed as one
+    (blocks x zones) NumPy broadcast instead of a Python loop per pair; on
+    very dense pages an STRtree narrows that to the pairs whose boxes
+    actually overlap.
+    Without NumPy, each block is only tested against the zones in its
+    grid cell (_zone_grid).
+    """
+    if not blocks or not scaled_zones:
+        return [None] * len(blocks)
+    zone_boxes = [_zone_box(z) for z in scaled_zones]
+    if np is None:
+        zones_near = _zone_grid(zone_boxes, page_w, page_h, margin)
+        return [_assign_storyid(block, zones_near(block), margin=margin) for block in blocks]
+
+    zones_xyxy = np.array([box[:4] for box in zone_boxes], dtype=np.float64)
+    blocks_xyxy = np.array([b._xyxy for b in blocks], dtype=np.float64)
+    sids = [box[4] for box in zone_boxes]
+    if njit is not None:
+        best = _assign_kernel(blocks_xyxy, zones_xyxy, float(margin))
+        return [sids[k] if k >= 0 else None for k in best.tolist()]
+    if STRtree is not None and len(blocks) * len(scaled_zones) >= STRTREE_MIN_PAIRS:
+        return _assign_storyids_strtree(blocks_xyxy, zones_xyxy, sids, margin)
+
+    zl, zt, zr, zb = zones_xyxy.T
+    # (N, 1) columns broadcast against (K,) zone edges -> (N, K)
+    bl, bt, br, bb = (col[:, None] for col in blocks_xyxy.T)
+
+    cx = (bl + br) / 2
+    cy = (bt + bb) / 2
+    inside = (zl - margin <= cx) & (cx <= zr + margin) & (zt - margin <= cy) & (cy <= zb + margin)
+
+    inter_w = np.clip(np.minimum(br, zr) - np.maximum(bl, zl), 0.0, None)
+    inter_h = np.clip(np.minimum(bb, zb) - np.maximum(bt, zt), 0.0, None)
+    inter = np.where(inside, inter_w * inter_h, 0.0)
+
+    # Block area is constant per row, so the best overlap percentage is
+    # the best intersection area; argmax keeps the first zone on ties.
+    block_area = np.clip(br - bl, 0.0, None)[:, 0] * np.clip(bb - bt, 0.0, None)[:, 0]
+    best = inter.argmax(axis=1)
+    found = (block_area > 0) & (inter[np.arange(len(blocks)), best] > 0)
+
+    return [sids[k] if ok else None for k, ok in zip(best.tolist(), found.tolist())]
+
+
+if njit is not None:
+
+    @njit(cache=True)
+    def _assign_kernel(blocks_xyxy, zones_xyxy, margin):
+        """Best zone index per block (-1 if none), same rules as _assign_storyid.
+
+        One pass with O(1) scratch instead of an (N, K) intersection array.
+        """
+        n_blocks = blocks_xyxy.shape[0]
+        n_zones = zones_xyxy.shape[0]
+        best = np.full(n_blocks, -1, np.int32)
+        for i in range(n_blocks):
+            bl = blocks_xyxy[i, 0]
+            bt = blocks_xyxy[i, 1]
+            br = blocks_xyxy[i, 2]
+            bb = blocks_xyxy[i, 3]
+            if max(0.0, br - bl) * max(0.0, bb - bt) <= 0.0:
+                continue
+            cx = 0.5 * (bl + br)
+            cy = 0.5 * (bt + bb)
+            best_inter = 0.0
+            for j in range(n_zones):
+                zl = zones_xyxy[j, 0]
+                zt = zones_xyxy[j, 1]
+                zr = zones_xyxy[j, 2]
+                zb = zones_xyxy[j, 3]
+                if not (zl - margin <= cx <= zr + margin and zt - margin <= cy <= zb + margin):
+                    continue
+                inter = max(0.0, min(br, zr) - max(bl, zl)) * max(0.0, min(bb, zb) - max(bt, zt))
+                if inter > best_inter:
+                    best_inter = inter
+                    best[i] = j
+        return best
+
+
+def _assign_storyids_strtree(
+    blocks_xyxy: np.ndarray,
+    zones_xyxy: np.ndarray,
+    sids: list[str],
+    margin: float,
+) -> list[str | None]:
+    """STRtree spatial join variant of _assign_storyids."""
+    # A zone can only win if it intersects the block itself, so the
+    # block's own box (no margin) is enough to find every candidate.
+    tree = STRtree(shapely.box(*zones_xyxy.T))
+    block_idx, zone_idx = tree.query(shapely.box(*blocks_xyxy.T))
+
+    b = blocks_xyxy[block_idx]
+    z = zones_xyxy[zone_idx]
+    cx = (b[:, 0] + b[:, 2]) / 2
+    cy = (b[:, 1] + b[:, 3]) / 2
+    inside = (
+        (z[:, 0] - margin <= cx) & (cx <= z[:, 2] + margin)
+        & (z[:, 1] - margin <= cy) & (cy <= z[:, 3] + margin)
+    )
+    inter_w = np.clip(np.minimum(b[:, 2], z[:, 2]) - np.maximum(b[:, 0], z[:, 0]), 0.0, None)
+    inter_h = np.clip(np.minimum(b[:, 3], z[:, 3]) - np.maximum(b[:, 1], z[:, 1]), 0.0, None)
+    inter = inter_w * inter_h
+    block_area = np.clip(b[:, 2] - b[:, 0], 0.0, None) * np.clip(b[:, 3] - b[:, 1], 0.0, None)
+
+    keep = inside & (inter > 0) & (block_area > 0)
+    block_idx, zone_idx, inter = block_idx[keep], zone_idx[keep], inter[keep]
+
+    # Per block: largest intersection first, lowest zone index on ties
+    order = np.lexsort((zone_idx, -inter, block_idx))
+    winners, first = np.unique(block_idx[order], return_index=True)
+
+    assigned: list[str | None] = [None] * len(blocks_xyxy)
+    for b_i, z_i in zip(winners.tolist(), zone_idx[order][first].tolist()):
+        assigned[b_i] = sids[z_i]
+    return assigned
+
+
+def _est_col_width(page_w: float) -> float:
+    """Column width used to bin blocks into columns (see _sort_article_blocks)."""
+    return max(1.0, float(page_w) / 50.0)
+
+
+def _sort_article_blocks(blocks: list[Block]) -> list[Block]:
     """
     Column-aware block ordering with dynamic binning.
 
     Rules:
-    1) Estimate column width from article zone width
-    2) Assign dynamic col_bin by x0 / est_col_width
+    1) Estimate column width from the page width (_est_col_width)
+    2) Assign dynamic col_bin by x0 / est_col_width (done in _serialize_blocks)
     3) Sort by (col_bin, y0)
     """
-    if not blocks:
-        return blocks
-
-    est_col_width = max(1.0, float(page_w) / 50.0)
-    for block in blocks:
-        block["col_bin"] = int(float(block.get("x0", 0.0)) / est_col_width)
-
-    return sorted(blocks, key=lambda b: (int(b["col_bin"]), float(b["y0"])))
+    return sorted(blocks, key=attrgetter("col_bin", "y0"))
 
 
 def _split_compound_articles(articles: list[dict[str, Any]]) -> list[dict[str, Any]]:
@@ -316,17 +798,17 @@ def _split_compound_articles(articles: list[dict[str, Any]]) -> list[dict[str, A
             continue
 
         base_storyid = str(article.get("storyid", ""))
-        current_blocks: list[dict[str, Any]] = []
+        current_blocks: list[Block] = []
         part_idx = 1
-        prev_block: dict[str, Any] | None = None
+        prev_block: Block | None = None
 
         for current_block in blocks:
             should_split = False
             if prev_block is not None and current_blocks:
-                gap_y = float(current_block["y0"]) - float(prev_block["y1"])
+                gap_y = current_block.y0 - prev_block.y1
                 width_jump = (
-                    float(current_block["width"]) > float(prev_block["width"]) * 1.5
-                    if float(prev_block["width"]) > 0
+                    current_block.width > prev_block.width * 1.5
+                    if prev_block.width > 0
                     else False
                 )
                 if gap_y > 25.0 or width_jump:
@@ -360,6 +842,170 @@ def _split_compound_articles(articles: list[dict[str, Any]]) -> list[dict[str, A
     return split_articles
 
 
+_worker_docs: dict[str, Any] = {}
+_image_writer: ThreadPoolExecutor | None = None
+
+
+def _worker_doc(pdf_abs: str) -> Any:
+    """Per-process document handle; PyMuPDF documents can't be shared across processes."""
+    doc = _worker_docs.get(pdf_abs)
+    if doc is None:
+        doc = _worker_docs[pdf_abs] = fitz.open(pdf_abs)
+    return doc
+
+
+def _write_bytes_atomic(path: str, data: bytes) -> None:
+    """Write to path + ".part" and rename into place, so a killed run never
+    leaves a truncated file at `path` for the next run to reuse."""
+    part = path + ".part"
+    try:
+        Path(part).write_bytes(data)
+        os.replace(part, path)
+    except BaseException:
+        if os.path.exists(part):
+            os.remove(part)
+        raise
+
+
+def _write_image(img_path: str, data: bytes) -> Future:
+    """Write an encoded page image on a background thread."""
+    global _image_writer
+    if _image_writer is None:
+        _image_writer = ThreadPoolExecutor(max_workers=2)
+    return _image_writer.submit(_write_bytes_atomic, img_path, data)
+
+
+def _jpeg_size(path: str) -> tuple[int, int] | None:
+    """(width, height) from a JPEG's SOF header, or None if it can't be read.
+
+    Only the header is read, so checking a cached page image is cheap.
+    """
+    try:
+        with open(path, "rb") as f:
+            data = f.read(1 << 16)
+    except OSError:
+        return None
+    if data[:2] != b"\xff\xd8":
+        return None
+    i = 2
+    while i + 9 <= len(data):
+        if data[i] != 0xFF:
+            return None
+        marker = data[i + 1]
+        if marker == 0xFF:  # fill byte
+            i += 1
+            continue
+        # SOF0..SOF15, except DHT (C4), JPG (C8) and DAC (CC)
+        if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+            height = int.from_bytes(data[i + 5:i + 7], "big")
+            width = int.from_bytes(data[i + 7:i + 9], "big")
+            return width, height
+        i += 2 + int.from_bytes(data[i + 2:i + 4], "big")
+    return None
+
+
+def _article_sort_key(a: dict[str, Any]) -> tuple[float, float]:
+    if a["blocks"]:
+        first = a["blocks"][0]
+        return first.y0, first.x0
+    if a["zones"]:
+        z = a["zones"][0]["scaled"]
+        return float(z["top"]), float(z["left"])
+    return (10_000_000.0, 10_000_000.0)
+
+
+def _process_page(
+    pdf_abs: str,
+    page_num: int,
+    scraped_zones: list[dict[str, Any]],
+    scale: float,
+    images_dir: str,
+    zone_margin: float,
+    force_render: bool = False,
+) -> dict[str, Any]:
+    """Render one page to JPG and group its text blocks into article zones.
+
+    Runs in a worker process, so everything it needs is passed in.  A JPG
+    newer than the PDF and already at this DPI's pixel size is kept as-is
+    unless force_render is set.
+    """
+    page = _worker_doc(pdf_abs)[page_num - 1]
+    page_w = float(page.rect.width)
+    page_h = float(page.rect.height)
+
+    img_name = f"page_{page_num}.jpg"
+    img_path = os.path.join(images_dir, img_name)
+
+    matrix = fitz.Matrix(scale, scale)
+    pix_rect = (page.rect * matrix).irect  # the size get_pixmap will produce
+    img_written: Future | None = None
+    if force_render or not (
+        os.path.exists(img_path)
+        and os.path.getmtime(img_path) >= os.path.getmtime(pdf_abs)
+        and _jpeg_size(img_path) == (pix_rect.width, pix_rect.height)
+    ):
+        # Encode here, write in the background while the text is processed
+        pix = page.get_pixmap(matrix=matrix, alpha=False)
+        img_written = _write_image(img_path, pix.tobytes("jpeg", jpg_quality=JPG_QUALITY))
+
+    raw_blocks = page.get_text("blocks", flags=TEXT_FLAGS)
+    serialized_blocks = _serialize_blocks(raw_blocks, page_num, page_w, page_h)
+
+    scaled_zones = [_scaled_zone(z, page_w, page_h) for z in scraped_zones]
+
+    articles_map: dict[str, dict[str, Any]] = {}
+    for z in scaled_zones:
+        sid = str(z["storyid"])
+        if sid not in articles_map:
+            articles_map[sid] = {"storyid": sid, "zones": [], "blocks": []}
+        articles_map[sid]["zones"].append(z)
+
+    unassigned: list[Block] = []
+
+    assigned = _assign_storyids(serialized_blocks, scaled_zones, zone_margin, page_w, page_h)
+    for block, sid in zip(serialized_blocks, assigned):
+        if sid is None:
+            unassigned.append(block)
+        else:
+            if sid not in articles_map:
+                articles_map[sid] = {"storyid": sid, "zones": [], "blocks": []}
+            articles_map[sid]["blocks"].append(block)
+
+    for article in articles_map.values():
+        article["blocks"] = _sort_article_blocks(article["blocks"])
+
+    unassigned.sort(key=attrgetter("y0", "x0"))
+
+    articles = list(articles_map.values())
+    articles.sort(key=_article_sort_key)
+    articles = _split_compound_articles(articles)
+
+    # The page is only reported once its image is on disk
+    if img_written is not None:
+        img_written.result()
+
+    return {
+        "page_num": page_num,
+        "page_width": round(page_w, 3),
+        "page_height": round(page_h, 3),
+        "image_local": img_path.replace("/", "\\"),
+        "articles": articles,
+        "unassigned": unassigned,
+    }
+
+
+def _process_page_json(*args: Any) -> tuple[bytes, int, int]:
+    """_process_page, returning (page JSON, assigned blocks, unassigned blocks).
+
+    Shipping bytes back from the worker is cheaper than pickling the dict,
+    and lets parse_pdf stream pages to disk without holding them; the
+    counts are all it keeps.
+    """
+    page = _process_page(*args)
+    assigned = sum(len(a["blocks"]) for a in page["articles"])
+    return orjson.dumps(page), assigned, len(page["unassigned"])
+
+
 def parse_pdf(
     pdf_path: str,
     date_str: str | None = None,
@@ -370,8 +1016,13 @@ def parse_pdf(
     epaper_url: str = "https://epaper.aajtak.in/",
     max_carousel_clicks: int = 12,
     no_scrape_zones: bool = False,
+    force_render: bool = False,
 ) -> dict[str, Any]:
-    """Parse PDF blocks, map to article zones, and export JPG page backgrounds."""
+    """Parse PDF blocks, map to article zones, and export JPG page backgrounds.
+
+    The pages are written to out_json only; the returned dict holds the
+    document-level fields plus block_count / assigned_count totals.
+    """
     if date_str is None:
         date_str = _default_date()
 
@@ -395,97 +1046,62 @@ def parse_pdf(
             print(f"WARN: zone scraping failed ({type(exc).__name__}: {exc}); all blocks will be unassigned")
 
     scale = max(72, dpi) / 72.0
-    matrix = fitz.Matrix(scale, scale)
 
     pdf_abs = str(Path(pdf_path).resolve())
-    pages: list[dict[str, Any]] = []
-
     with fitz.open(pdf_abs) as doc:
-        for i, page in enumerate(doc, start=1):
-            page_w = float(page.rect.width)
-            page_h = float(page.rect.height)
-
-            img_name = f"page_{i}.jpg"
-            img_path = os.path.join(images_dir, img_name)
-
-            pix = page.get_pixmap(matrix=matrix, alpha=False)
-            pix.save(img_path)
-
-            raw_blocks = page.get_text("blocks")
-            serialized_blocks: list[dict[str, Any]] = []
-            for b_idx, block in enumerate(raw_blocks, start=1):
-                block_id = f"p{i}_b{b_idx}"
-                parsed = _serialize_block(block, block_id, page_w, page_h)
-                if parsed:
-                    serialized_blocks.append(parsed)
-
-            scraped_for_page = page_zones.get(i, [])
-            scaled_zones = [_scaled_zone(z, page_w, page_h) for z in scraped_for_page]
-
-            articles_map: dict[str, dict[str, Any]] = {}
-            for z in scaled_zones:
-                sid = str(z["storyid"])
-                if sid not in articles_map:
-                    articles_map[sid] = {"storyid": sid, "zones": [], "blocks": []}
-                articles_map[sid]["zones"].append(z)
-
-            unassigned: list[dict[str, Any]] = []
-
-            for block in serialized_blocks:
-                sid = _assign_storyid(block, scaled_zones, margin=zone_margin)
-                if sid is None:
-                    unassigned.append(block)
-                else:
-                    if sid not in articles_map:
-                        articles_map[sid] = {"storyid": sid, "zones": [], "blocks": []}
-                    articles_map[sid]["blocks"].append(block)
-
-            for article in articles_map.values():
-                article["blocks"] = _sort_article_blocks(article["blocks"], page_w)
-
-            unassigned.sort(key=lambda b: (float(b["y0"]), float(b["x0"])))
-
-            articles = list(articles_map.values())
-
-            def _article_sort_key(a: dict[str, Any]) -> tuple[float, float]:
-                if a["blocks"]:
-                    first = a["blocks"][0]
-                    return float(first["y0"]), float(first["x0"])
-                if a["zones"]:
-                    z = a["zones"][0]["scaled"]
-                    return float(z["top"]), float(z["left"])
-                return (10_000_000.0, 10_000_000.0)
-
-            articles.sort(key=_article_sort_key)
-            articles = _split_compound_articles(articles)
-
-            pages.append(
-                {
-                    "page_num": i,
-                    "page_width": round(page_w, 3),
-                    "page_height": round(page_h, 3),
-                    "image_local": img_path.replace("/", "\\"),
-                    "articles": articles,
-                    "unassigned": unassigned,
-                }
-            )
+        page_count = doc.page_count
 
-    result = {
+    result: dict[str, Any] = {
         "date": date_str,
         "source_pdf": pdf_abs,
-        "page_count": len(pages),
+        "page_count": page_count,
         "dpi": dpi,
         "coord_space": {
             "width": COORD_SPACE_W,
             "height": COORD_SPACE_H,
         },
         "zone_margin": zone_margin,
-        "pages": pages,
     }
-
-    with open(out_json, "w", encoding="utf-8") as f:
-        json.dump(result, f, ensure_ascii=False, indent=2)
-
+    # Everything but "pages", which closes the object
+    head = orjson.dumps(result, option=orjson.OPT_INDENT_2)[:-2]
+
+    # Pages are independent: render, extract and assign them in parallel.
+    # Each finished page's JSON goes straight into the output (one page per
+    # line, in page order -- ex.map preserves it), so no page is held in
+    # memory after it is written.  The file is built as out_json.part and
+    # renamed into place, so a crash leaves the previous out_json intact.
+    block_count = 0
+    assigned_count = 0
+    part = out_json + ".part"
+    try:
+        with open(part, "wb") as out:
+            out.write(head + b',\n  "pages": [\n')
+            if page_count:
+                with ProcessPoolExecutor(max_workers=min(page_count, os.cpu_count() or 1)) as ex:
+                    for n, (page_json, assigned, unassigned) in enumerate(ex.map(
+                        _process_page_json,
+                        repeat(pdf_abs),
+                        range(1, page_count + 1),
+                        [page_zones.get(i, []) for i in range(1, page_count + 1)],
+                        repeat(scale),
+                        repeat(images_dir),
+                        repeat(zone_margin),
+                        repeat(force_render),
+                    )):
+                        if n:
+                            out.write(b",\n")
+                        out.write(page_json)
+                        assigned_count += assigned
+                        block_count += assigned + unassigned
+            out.write(b"\n  ]\n}")
+        os.replace(part, out_json)
+    except BaseException:
+        if os.path.exists(part):
+            os.remove(part)
+        raise
+
+    result["block_count"] = block_count
+    result["assigned_count"] = assigned_count
     return result
 
 
@@ -500,6 +1116,7 @@ def main() -> None:
     parser.add_argument("--epaper-url", default="https://epaper.aajtak.in/", help="Source URL for pagerectangle scraping")
     parser.add_argument("--max-carousel-clicks", type=int, default=12, help="How many next-button clicks to preload slides")
     parser.add_argument("--no-scrape-zones", action="store_true", help="Skip Playwright zone scrape (all blocks become unassigned)")
+    parser.add_argument("--force-render", action="store_true", help="Re-render page JPGs even if they are newer than the PDF (e.g. after changing --dpi)")
     args = parser.parse_args()
 
     result = parse_pdf(
@@ -512,15 +1129,11 @@ def main() -> None:
         epaper_url=args.epaper_url,
         max_carousel_clicks=args.max_carousel_clicks,
         no_scrape_zones=args.no_scrape_zones,
+        force_render=args.force_render,
     )
 
-    total_blocks = 0
-    total_assigned = 0
-    for pg in result["pages"]:
-        assigned_here = sum(len(a.get("blocks", [])) for a in pg.get("articles", []))
-        unassigned_here = len(pg.get("unassigned", []))
-        total_assigned += assigned_here
-        total_blocks += assigned_here + unassigned_here
+    total_blocks = result["block_count"]
+    total_assigned = result["assigned_count"]
 
     print(f"Done: {result['page_count']} pages, {total_blocks} text blocks")
     print(f"Assigned to stories: {total_assigned}, unassigned: {total_blocks - total_assigned}")
@@ -16,19 +16,25 @@ This ensures:
   - Body text stays body-length
   - No mixing between blocks
   - 1:1 mapping for rendering
+
+Usage (from the repo root, so the shared translate_core is importable):
+    python -m v3.translator YYYY-MM-DD
 """
 
 from __future__ import annotations
 
+import asyncio
 import json
 import os
 import re
-import time
 from pathlib import Path
 from typing import Any
 
+import orjson
 from dotenv import load_dotenv
-from openai import OpenAI
+from openai import AsyncOpenAI
+
+from translate_core import TokenBucket, make_client, parse_retry_seconds, strip_fence
 
 DATA_DIR = "data"
 
@@ -66,82 +72,68 @@ MIN_TRANSLATE_CHARS = 15
 # Max blocks per LLM call -- prevents token overflow and dropped keys
 MAX_BLOCKS_PER_BATCH = 12
 
+# Max LLM requests in flight at once (across all articles and batches)
+CONCURRENCY = 8
+
+# Groq free-tier request budget; concurrency alone would blow through it on
+# long editions, so requests are also paced through a token bucket
+RATE_LIMIT_RPM = 30
+
 
-def _make_client() -> OpenAI | None:
+def _make_client() -> AsyncOpenAI | None:
     """Create Groq-compatible OpenAI client, or None if no API key."""
     load_dotenv()
     api_key = os.getenv("GROQ_API_KEY", "").strip()
     if not api_key:
         print("  WARN: GROQ_API_KEY not set -- text_en will copy text_hi.")
         return None
-    return OpenAI(
-        api_key=api_key,
-        base_url="https://api.groq.com/openai/v1",
-    )
+    return make_client(api_key)
 
 
-def _build_keyed_dict(blocks: list[dict]) -> dict[str, str]:
-    """
-    Build a role-indexed dict from an article's blocks.
-
-    Example output:
-      {"headline_0": "...", "subheadline_0": "...",
-       "body_0": "...", "body_1": "...", "byline_0": "..."}
-    """
-    role_counters: dict[str, int] = {}
-    keyed: dict[str, str] = {}
-
-    for blk in blocks:
-        role = blk.get("role", "body")
-        idx = role_counters.get(role, 0)
-        role_counters[role] = idx + 1
-        key = f"{role}_{idx}"
-        keyed[key] = blk.get("text", "").strip()
-
-    return keyed
+# A JSON object with at most one level of nesting
+_RE_OBJECT = re.compile(r"\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}", re.DOTALL)
 
 
 def _parse_json_response(raw: str) -> dict[str, str] | None:
     """Try to parse a JSON dict from the LLM response, tolerating markdown fences."""
-    text = raw.strip()
-
     # Strip markdown code fences if present
-    if text.startswith("```"):
-        # Remove opening fence (```json or ```)
-        text = re.sub(r"^```[a-zA-Z]*\n?", "", text)
-        # Remove closing fence
-        text = re.sub(r"\n?```\s*$", "", text)
-        text = text.strip()
+    text = strip_fence(raw)
 
     try:
-        parsed = json.loads(text)
+        parsed = orjson.loads(text)
         if isinstance(parsed, dict):
             return parsed
-    except json.JSONDecodeError:
+    except orjson.JSONDecodeError:
         pass
 
     # Try to find JSON object in the text
-    match = re.search(r"\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}", text, re.DOTALL)
+    match = _RE_OBJECT.search(text)
     if match:
         try:
-            parsed = json.loads(match.group())
+            parsed = orjson.loads(match.group())
             if isinstance(parsed, dict):
                 return parsed
-        except json.JSONDecodeError:
+        except orjson.JSONDecodeError:
             pass
 
     return None
 
 
-def _translate_article_keyed(
-    client: OpenAI | None,
+async def _translate_article_keyed(
+    client: AsyncOpenAI | None,
     keyed_dict: dict[str, str],
+    sem: asyncio.Semaphore,
+    rpm_bucket: TokenBucket,
     retries: int = 3,
 ) -> dict[str, str]:
     """
     Translate a keyed dict of blocks via LLM.
     Returns a dict with same keys but English values.
     Falls back to Hindi text on failure.
+
+    Each attempt waits for a slot in rpm_bucket; a rate-limit error drains
+    the bucket for the advertised retry-after, so the retry (and every other
+    queued request) waits it out instead of failing again.
     """
     if client is None:
         return keyed_dict  # fallback
@@ -150,15 +142,17 @@ def _translate_article_keyed(
 
     for attempt in range(1, retries + 1):
         try:
-            resp = client.chat.completions.create(
-                model="meta-llama/llama-4-maverick-17b-128e-instruct",
-                messages=[
-                    {"role": "system", "content": SYSTEM_PROMPT},
-                    {"role": "user", "content": user_msg},
-                ],
-                temperature=0.15,
-                max_tokens=4096,
-            )
+            async with sem:
+                await rpm_bucket.acquire()
+                resp = await client.chat.completions.create(
+                    model="meta-llama/llama-4-maverick-17b-128e-instruct",
+                    messages=[
+                        {"role": "system", "content": SYSTEM_PROMPT},
+                        {"role": "user", "content": user_msg},
+                    ],
+                    temperature=0.15,
+                    max_tokens=4096,
+                )
             raw = (resp.choices[0].message.content or "").strip()
             parsed = _parse_json_response(raw)
 
@@ -180,8 +174,11 @@ def _translate_article_keyed(
 
         except Exception as exc:
             print(f"    translate error (attempt {attempt}): {exc}")
+            retry_seconds = parse_retry_seconds(str(exc))
+            if retry_seconds is not None:
+                rpm_bucket.penalize(retry_seconds)
             if attempt < retries:
-                time.sleep(1.5 * attempt)
+                await asyncio.sleep(1.5 * attempt)
 
     return keyed_dict  # fallback after all retries
 
@@ -326,9 +323,11 @@ def _merge_pointer_groups(blocks: list[dict]) -> list[list[int]]:
     return groups
 
 
-def _translate_blocks_batched(
-    client: OpenAI | None,
+async def _translate_blocks_batched(
+    client: AsyncOpenAI | None,
     blocks: list[dict],
+    sem: asyncio.Semaphore,
+    rpm_bucket: TokenBucket,
 ) -> None:
     """
     Translate an article's blocks, splitting into batches of
@@ -403,17 +402,19 @@ def _translate_blocks_batched(
     keys_list = [k for k in full_keyed.keys()]
     translated = {}
 
-    for batch_start in range(0, len(keys_list), MAX_BLOCKS_PER_BATCH):
-        batch_keys = keys_list[batch_start:batch_start + MAX_BLOCKS_PER_BATCH]
-        batch_dict = {k: full_keyed[k] for k in batch_keys}
-
-        batch_result = _translate_article_keyed(client, batch_dict)
+    # Batches are independent -- send them concurrently (bounded by sem)
+    batch_results = await asyncio.gather(*(
+        _translate_article_keyed(
+            client,
+            {k: full_keyed[k] for k in keys_list[batch_start:batch_start + MAX_BLOCKS_PER_BATCH]},
+            sem,
+            rpm_bucket,
+        )
+        for batch_start in range(0, len(keys_list), MAX_BLOCKS_PER_BATCH)
+    ))
+    for batch_result in batch_results:
         translated.update(batch_result)
 
-        # Rate limit between batches
-        if batch_start + MAX_BLOCKS_PER_BATCH < len(keys_list):
-            time.sleep(0.3)
-
     # Retry any blocks that are still Hindi
     retry_dict = {}
     for k in keys_list:
@@ -423,7 +424,7 @@ def _translate_blocks_batched(
 
     if retry_dict:
         print(f"    Retrying {len(retry_dict)} still-Hindi blocks...")
-        retry_result = _translate_article_keyed(client, retry_dict)
+        retry_result = await _translate_article_keyed(client, retry_dict, sem, rpm_bucket)
         for k, v in retry_result.items():
             if not _is_still_hindi(v):
                 translated[k] = v
@@ -477,6 +478,20 @@ def _translate_blocks_batched(
             blk["text_en"] = translated.get(key, blk.get("text", ""))
 
 
+async def _translate_all(client: AsyncOpenAI | None, articles: list[list[dict]]) -> None:
+    """Translate every article's blocks in place, CONCURRENCY requests at a
+    time and at most RATE_LIMIT_RPM per minute."""
+    sem = asyncio.Semaphore(CONCURRENCY)
+    rpm_bucket = TokenBucket(RATE_LIMIT_RPM, RATE_LIMIT_RPM / 60)
+    try:
+        await asyncio.gather(*(
+            _translate_blocks_batched(client, blocks, sem, rpm_bucket) for blocks in articles
+        ))
+    finally:
+        if client is not None:
+            await client.close()
+
+
 def translate_articles(date_str: str) -> dict[str, Any]:
     """
     Read pdf_blocks.json, translate each article block-by-block,
@@ -495,13 +510,11 @@ def translate_articles(date_str: str) -> dict[str, Any]:
 
     client = _make_client()
 
-    pages_out: list[dict[str, Any]] = []
     translated_count = 0
     skipped_count = 0
+    to_translate: list[list[dict]] = []
 
     for page in src.get("pages", []):
-        articles_out: list[dict[str, Any]] = []
-
         for article in page.get("articles", []):
             blocks = article.get("blocks", [])
             total_text = "".join(b.get("text", "") for b in blocks)
@@ -512,10 +525,17 @@ def translate_articles(date_str: str) -> dict[str, Any]:
                     blk["text_en"] = blk.get("text", "")
                 skipped_count += 1
             else:
-                # Translate with batching for large articles
-                _translate_blocks_batched(client, blocks)
+                to_translate.append(blocks)
                 translated_count += 1
 
+    # Translate all articles concurrently (with batching for large articles)
+    asyncio.run(_translate_all(client, to_translate))
+
+    pages_out: list[dict[str, Any]] = []
+    for page in src.get("pages", []):
+        articles_out: list[dict[str, Any]] = []
+
+        for article in page.get("articles", []):
             articles_out.append({
                 "article_id": article["article_id"],
                 "source": article.get("source", ""),
@@ -525,7 +545,7 @@ def translate_articles(date_str: str) -> dict[str, Any]:
                 "height_pct": article["height_pct"],
                 "block_count": article["block_count"],
                 "text": article.get("text", ""),
-                "blocks": blocks,
+                "blocks": article.get("blocks", []),
             })
 
         pages_out.append({